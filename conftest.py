@@ -1,110 +1,26 @@
 from multiprocessing import context
 import pytest
-import os
-import uuid
 import allure
-from playwright.sync_api import sync_playwright
-from pages.login_page import LoginPage
-
-
-@pytest.fixture(scope="session")
-def browser():
-    # GitHub Actions automatically sets CI=true
-    is_ci = os.getenv("CI") == "true"
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=is_ci, slow_mo=0 if is_ci else 200)
-        yield browser
-        browser.close()
-
-
-@pytest.fixture
-def page(browser):
-    context = browser.new_context()
-    page = context.new_page()
-    page.on("console", lambda msg: print("BROWSER LOG:", msg.type, msg.text))
-    page.on("pageerror", lambda exc: print("PAGE ERROR:", exc))
-    yield page
-    context.close()
-
-
-@pytest.fixture(scope="session")
-def user_credentials_map():
-    return {
-        "default": {
-            "email": os.getenv("UI_USER_DEFAULT_EMAIL", os.getenv("UI_TEST_EMAIL", "ngjipiqmftuoxbkecx@nespj.com")),
-            "password": os.getenv("UI_USER_DEFAULT_PASSWORD", os.getenv("UI_TEST_PASSWORD", "123456")),
-            "role": os.getenv("UI_USER_DEFAULT_ROLE", "parent"),
-        },
-        "child_1": {
-            "email": os.getenv("UI_USER_CHILD1_EMAIL", ""),
-            "password": os.getenv("UI_USER_CHILD1_PASSWORD", ""),
-            "role": os.getenv("UI_USER_CHILD1_ROLE", "child"),
-        },
-        "child_2": {
-            "email": os.getenv("UI_USER_CHILD2_EMAIL", ""),
-            "password": os.getenv("UI_USER_CHILD2_PASSWORD", ""),
-            "role": os.getenv("UI_USER_CHILD2_ROLE", "child"),
-        },
-    }
-
-
-@pytest.fixture
-def ui_user(request, user_credentials_map):
-    user_key = getattr(request, "param", "default")
-    if user_key not in user_credentials_map:
-        raise ValueError(f"Unknown ui user profile: {user_key}")
-    return user_credentials_map[user_key]
-
-
-@pytest.fixture(scope="session")
-def ui_auth_credentials(user_credentials_map):
-    return {
-        "email": user_credentials_map["default"]["email"],
-        "password": user_credentials_map["default"]["password"],
-    }
-
-
-@pytest.fixture
-def authenticated_user(page, ui_user):
-    if not ui_user["email"] or not ui_user["password"]:
-        raise ValueError("UI user credentials are missing. Set environment variables for the selected user profile.")
-
-    login_page = LoginPage(page)
-    with allure.step(f"Login as user: {ui_user['email']}"):
-        login_page.open_home()
-        login_page.login(ui_user["email"], ui_user["password"])
-        login_page.wait_until_logged_in(ui_user["email"])
-
-    yield {
-        "page": page,
-        "login_page": login_page,
-        "user": ui_user,
-        "email": ui_user["email"],
-    }
-
-    if login_page.is_tasks_section_visible():
-        with allure.step("Logout in fixture teardown"):
-            login_page.logout()
-
-
-@pytest.fixture
-def test_data_factory():
-    def _build(prefix="qa"):
-        token = uuid.uuid4().hex[:8]
-        return {
-            "name": f"{prefix}_{token}",
-            "email": f"{prefix}_{token}@example.com",
-            "title": f"{prefix}_task_{token}",
-        }
-
-    return _build
+from core.parallel import add_parallel_options, register_parallel, worker_id
+from core.sharding import add_sharding_options, register_sharding
+from core.step_timing import add_step_timing_options, register_step_timing
+from core.wait_profiler import get_default_profiler
+
+# Browser/page and user/login fixtures live in tests/fixtures/ (see TEST_AUTOMATION_GUIDELINES.md).
+pytest_plugins = ["tests.fixtures.browser", "tests.fixtures.users"]
+
 
 import os
 import datetime
 import pytest
 
 
+def pytest_addoption(parser):
+    add_step_timing_options(parser)
+    add_parallel_options(parser)
+    add_sharding_options(parser)
+
+
 def pytest_configure(config):
     """
     Runs before any test session starts.
@@ -113,6 +29,9 @@ def pytest_configure(config):
 
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     results_dir = f"allure-results-{timestamp}"
+    if worker_id() and os.getenv("ALLURE_RESULTS_DIR"):
+        # --ui-workers: every worker writes into the controller's results directory.
+        results_dir = os.environ["ALLURE_RESULTS_DIR"]
 
     # store for later usage (optional)
     config.option.allure_report_dir = results_dir
@@ -122,4 +41,30 @@ def pytest_configure(config):
 
     print(f"\nAllure results will be saved to: {results_dir}\n")
 
+    register_step_timing(config)
+    register_parallel(config, register_sharding(config))
+
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Expose each phase report on the item (item.rep_setup / rep_call / rep_teardown)
+    so fixtures can react to test failure during teardown.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+    buffers = getattr(item, "funcargs", {}).get("browser_console")
+    if report.failed and report.when in ("setup", "call") and buffers:
+        for buffer in buffers:
+            log = buffer.format()
+            report.sections.append((f"Browser console ({buffer.name})", log))
+            allure.attach(log, name=f"Browser console ({buffer.name})", attachment_type=allure.attachment_type.TEXT)
+
+
+def pytest_terminal_summary(terminalreporter):
+    profiler = get_default_profiler()
+    if profiler.summary():
+        terminalreporter.write_sep("-", "UI time per page-object call site (ms)")
+        terminalreporter.write_line(profiler.format_table())
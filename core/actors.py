@@ -0,0 +1,113 @@
+import os
+
+
+class Actor:
+    def __init__(self, name, email, password):
+        self.name = name
+        self.email = email
+        self.password = password
+        self.app = None
+        self.storage_state = None
+
+
+class ActorSession:
+    """
+    Named users (parent, child, ...) taking part in one journey.
+
+    mode "contexts": every actor keeps its own logged-in browser context and page, so
+    switching actors is just picking a different page-object handle.
+    mode "relogin": all actors share one page and switching logs out and back in via the UI.
+
+    app_class is the page object wrapped around each page (e.g. FamilyAppPage); it must
+    provide open_home, login, wait_until_logged_in, switch_user_via_ui and is_session_restored.
+
+    storage_states()/restore() export and seed each actor's browser storage (cookies, local
+    storage, IndexedDB) so a resumed journey starts actors already logged in; an actor whose
+    restored session is rejected logs in through the UI as usual.
+    """
+
+    MODES = ("contexts", "relogin")
+
+    def __init__(self, page, page_factory, app_class, mode="contexts"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown actor mode: {mode}. Expected one of {self.MODES}")
+        self.mode = mode
+        self._first_page = page
+        self._page_factory = page_factory
+        self._app_class = app_class
+        self._actors = {}
+        self._current = None
+        self._storage_states = {}
+
+    @classmethod
+    def from_env(cls, page, page_factory, app_class):
+        return cls(page, page_factory, app_class, mode=os.getenv("UI_ACTOR_MODE", "contexts"))
+
+    def add(self, name, email, password):
+        self._actors[name] = Actor(name, email, password)
+        self._actors[name].storage_state = self._storage_states.get(name)
+
+    def _login(self, actor, app):
+        app.open_home()
+        app.login(actor.email, actor.password)
+        app.wait_until_logged_in(actor.email)
+
+    def _login_or_restore(self, actor, app):
+        if actor.storage_state is not None and app.is_session_restored(actor.email):
+            return
+        self._login(actor, app)
+
+    def use(self, name):
+        actor = self._actors[name]
+
+        if self.mode == "contexts":
+            if actor.app is None:
+                if actor.storage_state is not None:
+                    page = self._page_factory(storage_state=actor.storage_state)
+                else:
+                    page = self._first_page if self._first_page is not None else self._page_factory()
+                    self._first_page = None
+                actor.app = self._app_class(page)
+                self._login_or_restore(actor, actor.app)
+            self._current = actor
+            return actor.app
+
+        if self._current is None:
+            if actor.storage_state is not None:
+                self._first_page.context.set_storage_state(actor.storage_state)
+            app = self._app_class(self._first_page)
+            self._login_or_restore(actor, app)
+        elif self._current is not actor:
+            app = self._current.app
+            app.switch_user_via_ui(actor.email, actor.password)
+        else:
+            return actor.app
+        for other in self._actors.values():
+            other.app = None
+        actor.app = app
+        self._current = actor
+        return app
+
+    def storage_states(self):
+        """Browser storage of every actor that currently holds a logged-in page, keyed by actor name."""
+        holders = self._actors.values() if self.mode == "contexts" else [self._current] if self._current else []
+        return {
+            actor.name: actor.app.page.context.storage_state(indexed_db=True)
+            for actor in holders
+            if actor.app is not None
+        }
+
+    def restore(self, storage_states):
+        """Seed actors (already added or added later) with storage captured by storage_states()."""
+        self._storage_states = dict(storage_states)
+        for name, state in self._storage_states.items():
+            if name in self._actors:
+                self._actors[name].storage_state = state
+
+    def get(self, name):
+        """Return an actor's page without switching to it (None if it never logged in or shares a page)."""
+        return self._actors[name].app
+
+    @property
+    def current(self):
+        return self._current.name if self._current else None
@@ -0,0 +1,153 @@
+import json
+import math
+import os
+import threading
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from core.paths import cache_dir
+
+
+class AdaptiveTimeouts:
+    """
+    Per wait-site timeout budgets learned from how long the same wait took in earlier runs.
+
+    budget = clamp(p99 of recorded durations * factor, floor, ceiling) once a site has
+    min_samples observations; until then, and when disabled, the hard-coded default is used.
+    The default also acts as the ceiling unless UI_TIMEOUT_CEILING_MS overrides it, so learning
+    can only make a wait fail sooner, never later.
+
+    A wait that times out is recorded as having taken at least the budget it was given, so an
+    environment that gets slower pushes its p99, and with it the budget, back up.
+    """
+
+    MAX_SAMPLES = 200
+
+    def __init__(self, path=None, factor=3.0, floor_ms=3000, ceiling_ms=None, min_samples=5, enabled=True):
+        self.path = path or os.path.join(cache_dir("timings"), "wait_history.json")
+        self.factor = factor
+        self.floor_ms = floor_ms
+        self.ceiling_ms = ceiling_ms
+        self.min_samples = min_samples
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._history = self._read()
+        self._new_samples = {}
+        self._timeouts = {}
+
+    @classmethod
+    def from_env(cls):
+        ceiling = os.getenv("UI_TIMEOUT_CEILING_MS")
+        return cls(
+            factor=float(os.getenv("UI_TIMEOUT_FACTOR", "3.0")),
+            floor_ms=int(os.getenv("UI_TIMEOUT_FLOOR_MS", "3000")),
+            ceiling_ms=int(ceiling) if ceiling else None,
+            min_samples=int(os.getenv("UI_TIMEOUT_MIN_SAMPLES", "5")),
+            enabled=os.getenv("UI_ADAPTIVE_TIMEOUTS", "true").lower() != "false",
+        )
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as source:
+                return json.load(source)
+        except (OSError, ValueError):
+            return {}
+
+    def _p99(self, site):
+        samples = sorted(self._history.get(site, []))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(0.99 * len(samples)) - 1)]
+
+    def budget(self, site, default_ms):
+        if not self.enabled:
+            return default_ms
+        with self._lock:
+            p99 = self._p99(site)
+        if p99 is None:
+            return default_ms
+        ceiling = self.ceiling_ms or default_ms
+        return int(min(ceiling, max(self.floor_ms, p99 * self.factor)))
+
+    def is_learned(self, site):
+        with self._lock:
+            return self.enabled and self._p99(site) is not None
+
+    def record(self, site, duration_ms):
+        with self._lock:
+            samples = self._history.setdefault(site, [])
+            samples.append(round(duration_ms, 1))
+            del samples[:-self.MAX_SAMPLES]
+            self._new_samples.setdefault(site, []).append(round(duration_ms, 1))
+
+    def record_timeout(self, site, duration_ms=None):
+        with self._lock:
+            self._timeouts[site] = self._timeouts.get(site, 0) + 1
+        if duration_ms is not None:
+            self.record(site, duration_ms)
+
+    def save(self):
+        with self._lock:
+            if not self._new_samples:
+                return
+            # Merge with whatever other sessions wrote meanwhile, then swap the file atomically.
+            merged = self._read()
+            for site, samples in self._new_samples.items():
+                merged[site] = (merged.get(site, []) + samples)[-self.MAX_SAMPLES:]
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as target:
+                json.dump(merged, target)
+            os.replace(tmp_path, self.path)
+            self._new_samples = {}
+
+    def summary(self):
+        with self._lock:
+            sites = set(self._history) | set(self._timeouts)
+            return {
+                site: {
+                    "samples": len(self._history.get(site, [])),
+                    "p99_ms": self._p99(site),
+                    "timeouts_this_run": self._timeouts.get(site, 0),
+                }
+                for site in sorted(sites)
+            }
+
+
+class WaitTimer:
+    """
+    Context manager handing out a site's budget and recording how long the wait took.
+    A timed-out wait counts as at least its budget; other errors say nothing about timing.
+    """
+
+    def __init__(self, timeouts, site, default_ms):
+        self.timeouts = timeouts
+        self.site = site
+        self.budget = timeouts.budget(site, default_ms)
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        if exc_type is None:
+            self.timeouts.record(self.site, elapsed_ms)
+        elif issubclass(exc_type, (PlaywrightTimeoutError, TimeoutError)):
+            self.timeouts.record_timeout(self.site, max(elapsed_ms, self.budget))
+        else:
+            self.timeouts.record_timeout(self.site)
+        return False
+
+
+_default_timeouts = None
+_default_timeouts_lock = threading.Lock()
+
+
+def get_adaptive_timeouts():
+    global _default_timeouts
+    with _default_timeouts_lock:
+        if _default_timeouts is None:
+            _default_timeouts = AdaptiveTimeouts.from_env()
+        return _default_timeouts
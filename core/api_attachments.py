@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import allure
+
+
+class AttachmentPolicy:
+    """
+    always      - attach every response body in full
+    truncated   - attach the first max_kb KB of every body plus a sha256 of the full body
+    on_failure  - keep bodies in memory and attach them (truncated) only when the test fails
+    off         - attach only the structured call metadata
+    """
+
+    MODES = ("always", "truncated", "on_failure", "off")
+
+    def __init__(self, mode="truncated", max_kb=64):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown API attachment policy: {mode}. Expected one of {self.MODES}")
+        self.mode = mode
+        self.max_kb = max_kb
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            mode=os.getenv("API_ATTACH_POLICY", "truncated"),
+            max_kb=int(os.getenv("API_ATTACH_MAX_KB", "64")),
+        )
+
+    @property
+    def max_bytes(self):
+        if self.mode == "always" or self.max_kb <= 0:
+            return 0
+        return self.max_kb * 1024
+
+
+def _prepare_body(meta, body, max_bytes):
+    digest = hashlib.sha256(body).hexdigest()
+    truncated = bool(max_bytes) and len(body) > max_bytes
+    text = body[:max_bytes].decode("utf-8", errors="replace") if truncated else body.decode("utf-8", errors="replace")
+    name = f"{meta['method']} {meta['path']} -> {meta['status']}"
+
+    if truncated:
+        header = f"# truncated to {max_bytes} of {len(body)} bytes, sha256={digest}\n"
+        return name, header + text, allure.attachment_type.TEXT, digest
+    return name, text, allure.attachment_type.JSON, digest
+
+
+class AttachmentPipeline:
+    """
+    Keeps Allure work off the request path: APIClient only records cheap metadata and a
+    reference to the raw body; a background writer thread hashes, truncates and decodes
+    bodies, and flush() attaches the prepared payloads once the test is over.
+    """
+
+    def __init__(self, policy=None):
+        self.policy = policy or AttachmentPolicy.from_env()
+        self._lock = threading.Lock()
+        self._calls = []
+        self._pending = []
+        self._deferred = []
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-attachments")
+
+    def record(self, method, response):
+        meta = {
+            "method": method,
+            "url": response.url,
+            "path": urlsplit(response.url).path,
+            "status": response.status_code,
+            "elapsed_ms": round(response.elapsed.total_seconds() * 1000, 1),
+            "size": len(response.content),
+        }
+
+        with self._lock:
+            self._calls.append(meta)
+            if self.policy.mode == "off":
+                return
+            if self.policy.mode == "on_failure":
+                self._deferred.append((meta, response.content))
+                return
+            self._pending.append(
+                (meta, self._writer.submit(_prepare_body, meta, response.content, self.policy.max_bytes))
+            )
+
+    def flush(self, failed=False):
+        with self._lock:
+            calls, self._calls = self._calls, []
+            pending, self._pending = self._pending, []
+            deferred, self._deferred = self._deferred, []
+
+        if failed:
+            max_bytes = self.policy.max_kb * 1024 if self.policy.max_kb > 0 else 0
+            pending.extend(
+                (meta, self._writer.submit(_prepare_body, meta, body, max_bytes)) for meta, body in deferred
+            )
+
+        for meta, future in pending:
+            name, text, attachment_type, digest = future.result()
+            meta["sha256"] = digest
+            allure.attach(text, name=name, attachment_type=attachment_type)
+
+        if calls:
+            allure.attach(
+                json.dumps(calls, indent=2),
+                name="API calls",
+                attachment_type=allure.attachment_type.JSON
+            )
+
+    def close(self):
+        self._writer.shutdown(wait=True)
+
+
+_default_pipeline = None
+_default_pipeline_lock = threading.Lock()
+
+
+def get_default_pipeline():
+    global _default_pipeline
+    with _default_pipeline_lock:
+        if _default_pipeline is None:
+            _default_pipeline = AttachmentPipeline()
+        return _default_pipeline
+
+
+def close_default_pipeline():
+    global _default_pipeline
+    with _default_pipeline_lock:
+        if _default_pipeline is not None:
+            _default_pipeline.close()
+            _default_pipeline = None
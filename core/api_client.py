@@ -1,61 +1,131 @@
 import os
-import requests
-import allure
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 from dotenv import load_dotenv
 
+from core.api_attachments import get_default_pipeline
+from core.http_pool import get_default_pool
+from core.latency import get_default_recorder
+from core.rate_limit import get_rate_limiter
+
 
 load_dotenv()
 
 
 class APIClient:
-    def __init__(self, base_url):
+    def __init__(
+        self,
+        base_url,
+        session_pool=None,
+        attachments=None,
+        rate_limiter=None,
+        cassette=None,
+        latency=None,
+    ):
         self.base_url = base_url
         self.token = os.getenv("GOREST_TOKEN")
+        self.session_pool = session_pool or get_default_pool()
+        self.attachments = attachments or get_default_pipeline()
+        self.rate_limiter = rate_limiter or get_rate_limiter(urlsplit(base_url).netloc)
+        self.cassette = cassette
+        self.latency = latency or get_default_recorder()
 
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
 
-    def get(self, endpoint):
-        response = requests.get(
-            f"{self.base_url}{endpoint}",
-            headers=self.headers
-        )
-        allure.attach(
-        response.text,
-        name="Response body",
-        attachment_type=allure.attachment_type.JSON
-        )
+    def _request(self, method, endpoint, **kwargs):
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            response = None
+            started = time.perf_counter()
+            try:
+                response = self.session_pool.request(
+                    method,
+                    f"{self.base_url}{endpoint}",
+                    headers=self.headers,
+                    **kwargs
+                )
+            finally:
+                self.rate_limiter.observe(response)
+                self.latency.record(
+                    method,
+                    endpoint,
+                    (time.perf_counter() - started) * 1000,
+                    response.status_code if response is not None else None
+                )
+            # A 429 is rejected before processing, so even a POST is safe to resend.
+            if not self.rate_limiter.should_retry(response, attempt):
+                break
+            attempt += 1
+
+        self.attachments.record(method, response)
+        if self.cassette is not None:
+            self.cassette.record(method, kwargs.get("json"), response)
 
         return response
 
-    def post(self, endpoint, payload):
-        response = requests.post(
-            f"{self.base_url}{endpoint}",
-            json=payload,
-            headers=self.headers
-        )
-        allure.attach(
-            response.text,
-            name="Response body",
-            attachment_type=allure.attachment_type.JSON
-        )
+    def get(self, endpoint, params=None):
+        return self._request("GET", endpoint, params=params)
 
-        return response
-        
+    def post(self, endpoint, payload):
+        return self._request("POST", endpoint, json=payload)
 
     def delete(self, endpoint):
-        response = requests.delete(
-            f"{self.base_url}{endpoint}",
-            headers=self.headers
-        )
-        allure.attach(
-            response.text,
-            name="Response body",
-            attachment_type=allure.attachment_type.JSON
-        )
+        return self._request("DELETE", endpoint)
 
-        return response
-        
+    def iter_pages(self, endpoint, params=None, per_page=None, max_pages=None):
+        """
+        Lazily walk a paginated list endpoint, yielding one parsed page (a list) at a time.
+        The next page is fetched in the background while the caller consumes the current one;
+        closing the generator early stops prefetching.
+        """
+        base_params = dict(params or {})
+        if per_page:
+            base_params["per_page"] = per_page
+
+        def fetch(page_number):
+            response = self.get(endpoint, params={**base_params, "page": page_number})
+            response.raise_for_status()
+            total_pages = response.headers.get("x-pagination-pages")
+            return response.json(), int(total_pages) if total_pages else None
+
+        def has_more(page_number, total_pages):
+            if max_pages is not None and page_number >= max_pages:
+                return False
+            return total_pages is None or page_number < total_pages
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-prefetch")
+        page_number = 1
+        pending = executor.submit(fetch, page_number)
+        try:
+            while pending is not None:
+                records, total_pages = pending.result()
+                pending = None
+                if not records:
+                    return
+                if has_more(page_number, total_pages):
+                    pending = executor.submit(fetch, page_number + 1)
+                yield records
+                page_number += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
+
+    def iter_records(self, endpoint, params=None, per_page=None, max_pages=None):
+        for records in self.iter_pages(endpoint, params=params, per_page=per_page, max_pages=max_pages):
+            yield from records
+
+    def pool_stats(self):
+        return self.session_pool.stats()
+
+    def rate_limit_stats(self):
+        return self.rate_limiter.stats()
+
+    def latency_summary(self):
+        return self.latency.summary()
@@ -0,0 +1,90 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from core.api_client import APIClient
+
+
+class AsyncAPIClient:
+    """
+    asyncio sibling of APIClient.
+    Requests run on a bounded thread pool over the same pooled session, so the
+    concurrency limit is also the number of connections kept busy per host.
+    """
+
+    def __init__(self, base_url, concurrency=None, **client_options):
+        self.sync_client = APIClient(base_url, **client_options)
+        self.concurrency = concurrency or int(os.getenv("API_ASYNC_CONCURRENCY", "10"))
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="async-api")
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    @property
+    def base_url(self):
+        return self.sync_client.base_url
+
+    def _limit(self):
+        # Semaphores bind to one event loop; fixtures may drive the client from several asyncio.run calls.
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _request(self, method, endpoint, **kwargs):
+        loop = asyncio.get_running_loop()
+        async with self._limit():
+            return await loop.run_in_executor(
+                self._executor,
+                lambda: self.sync_client._request(method, endpoint, **kwargs)
+            )
+
+    async def get(self, endpoint, params=None):
+        return await self._request("GET", endpoint, params=params)
+
+    async def post(self, endpoint, payload):
+        return await self._request("POST", endpoint, json=payload)
+
+    async def delete(self, endpoint):
+        return await self._request("DELETE", endpoint)
+
+    async def gather(self, calls, return_exceptions=False):
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+    async def create_users(self, payloads, endpoint="/users"):
+        responses = await self.gather(
+            [self.post(endpoint, payload) for payload in payloads],
+            return_exceptions=True
+        )
+        errors = [r for r in responses if isinstance(r, BaseException)]
+        failed = [r for r in responses if not isinstance(r, BaseException) and r.status_code != 201]
+        if errors or failed:
+            # Do not leak the users that did get created.
+            created = [
+                r.json()["id"] for r in responses
+                if not isinstance(r, BaseException) and r.status_code == 201
+            ]
+            await self.delete_users(created, endpoint=endpoint)
+            if errors:
+                raise errors[0]
+            raise AssertionError(
+                f"Bulk user creation failed for {len(failed)}/{len(responses)} users. "
+                f"First error: {failed[0].status_code} {failed[0].text}"
+            )
+        return [r.json()["id"] for r in responses]
+
+    async def delete_users(self, user_ids, endpoint="/users"):
+        responses = await self.gather(
+            [self.delete(f"{endpoint}/{user_id}") for user_id in user_ids],
+            return_exceptions=True
+        )
+        return dict(zip(user_ids, responses))
+
+    def pool_stats(self):
+        return self.sync_client.pool_stats()
+
+    def rate_limit_stats(self):
+        return self.sync_client.rate_limit_stats()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,59 @@
+import hashlib
+import os
+import time
+
+from core.paths import cache_dir
+
+
+class AuthStateCache:
+    """
+    Playwright storage state (cookies, localStorage and IndexedDB, where Firebase keeps
+    its session) saved per user profile, so a login is performed once and reused by
+    later contexts until the file expires. Tests marked fresh_login (the login smoke
+    tests) bypass it and refresh the saved state for everyone else.
+    """
+
+    def __init__(self, directory=None, ttl_seconds=1800, enabled=True):
+        self.directory = directory or cache_dir("auth-state")
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            ttl_seconds=int(os.getenv("UI_AUTH_STATE_TTL", "1800")),
+            enabled=os.getenv("UI_AUTH_STATE_CACHE", "true").lower() != "false",
+        )
+
+    def path_for(self, profile, email):
+        digest = hashlib.sha256(email.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.directory, f"{profile}-{digest}.json")
+
+    def load(self, profile, email):
+        if not self.enabled:
+            return None
+        path = self.path_for(profile, email)
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return None
+        if age > self.ttl_seconds:
+            self.invalidate(profile, email)
+            return None
+        return path
+
+    def save(self, context, profile, email):
+        if not self.enabled:
+            return None
+        path = self.path_for(profile, email)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        context.storage_state(path=tmp_path, indexed_db=True)
+        # Atomic swap so parallel sessions never read a half-written file.
+        os.replace(tmp_path, path)
+        return path
+
+    def invalidate(self, profile, email):
+        try:
+            os.remove(self.path_for(profile, email))
+        except OSError:
+            pass
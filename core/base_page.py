@@ -1,7 +1,20 @@
+from contextlib import contextmanager
+
+from core.adaptive_timeouts import WaitTimer, get_adaptive_timeouts
+from core.page_snapshot import SNAPSHOT_SCRIPT, PageSnapshot
+from core.wait_profiler import get_default_profiler
+
+
 class BasePage:
 
+    # name -> selector captured by snapshot(); subclasses declare the elements their is_*/get_* helpers read.
+    SNAPSHOT_SELECTORS = {}
+
     def __init__(self, page):
-        self.page = page
+        # Proxied so every goto/click/wait_for_* is timed against the page-object method issuing it.
+        self.page = get_default_profiler().wrap_page(page)
+        self._active_snapshot = None
+        self.timeouts = get_adaptive_timeouts()
 
     def open(self, url):
         self.page.goto(url)
@@ -14,3 +27,46 @@ class BasePage:
 
     def get_text(self, selector):
         return self.page.inner_text(selector)
+
+    def snapshot(self, selectors=None):
+        return PageSnapshot(self.page.evaluate(SNAPSHOT_SCRIPT, selectors or self.SNAPSHOT_SELECTORS))
+
+    @contextmanager
+    def batched_snapshot(self, selectors=None):
+        """Answer is_*/get_* helpers from one snapshot while the block runs instead of live queries."""
+        self._active_snapshot = self.snapshot(selectors)
+        try:
+            yield self._active_snapshot
+        finally:
+            self._active_snapshot = None
+
+    def _is_visible(self, name):
+        if self._active_snapshot is not None and name in self._active_snapshot:
+            return self._active_snapshot.is_visible(name)
+        locator = self.page.locator(self.SNAPSHOT_SELECTORS[name])
+        return locator.count() > 0 and locator.first.is_visible()
+
+    def _text(self, name, inner_text=False):
+        """textContent of the named element, or its rendered innerText when inner_text=True."""
+        if self._active_snapshot is not None and name in self._active_snapshot:
+            if inner_text:
+                return self._active_snapshot[name].inner_text.strip()
+            return self._active_snapshot.text(name)
+        locator = self.page.locator(self.SNAPSHOT_SELECTORS[name])
+        if locator.count() == 0:
+            return ""
+        if inner_text:
+            return locator.first.inner_text().strip()
+        return (locator.first.text_content() or "").strip()
+
+    def adaptive_wait(self, site, default_ms):
+        """
+        Time a wait under "<PageClass>.<site>" and expose its budget: default_ms until the site has
+        enough history, then p99 of its past durations * UI_TIMEOUT_FACTOR, clamped between
+        UI_TIMEOUT_FLOOR_MS and default_ms (or UI_TIMEOUT_CEILING_MS). A first attempt that is
+        followed by a reload fallback therefore gives up after that budget, not after default_ms.
+
+            with self.adaptive_wait("wait_for_open_task", timeout) as wait:
+                locator.wait_for(timeout=wait.budget)
+        """
+        return WaitTimer(self.timeouts, f"{type(self).__name__}.{site}", default_ms)
@@ -0,0 +1,204 @@
+import functools
+import json
+import os
+import threading
+import time
+
+import allure
+from playwright.sync_api import Error as PlaywrightError
+
+
+INSTALL_SCRIPT = """(() => {
+    if (window.__qaPerf) return;
+    const perf = window.__qaPerf = { longTasks: [] };
+    try {
+        new PerformanceObserver((list) => {
+            for (const entry of list.getEntries()) perf.longTasks.push([entry.startTime, entry.duration]);
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (error) {
+        perf.unsupported = true;
+    }
+})()"""
+
+COLLECT_SCRIPT = """([since, withNavigation]) => {
+    const perf = window.__qaPerf || { longTasks: [] };
+    const tasks = perf.longTasks.filter(([start]) => start >= since).map(([, duration]) => duration);
+    const memory = performance.memory;
+    const result = {
+        longTasks: {
+            count: tasks.length,
+            totalMs: tasks.reduce((sum, duration) => sum + duration, 0),
+            maxMs: tasks.length ? Math.max(...tasks) : 0,
+        },
+        heap: memory ? { usedMb: memory.usedJSHeapSize / 1048576, totalMb: memory.totalJSHeapSize / 1048576 } : null,
+    };
+    if (withNavigation) {
+        const nav = performance.getEntriesByType('navigation')[0];
+        result.navigation = nav ? {
+            ttfbMs: nav.responseStart,
+            domContentLoadedMs: nav.domContentLoadedEventEnd,
+            loadMs: nav.loadEventEnd,
+            transferBytes: nav.transferSize,
+        } : null;
+        result.paint = {};
+        for (const entry of performance.getEntriesByType('paint')) result.paint[entry.name] = entry.startTime;
+    }
+    return result;
+}"""
+
+
+def parse_budgets(raw):
+    # "logged_in_after_submit=1500,open_tasks=800" -> {"logged_in_after_submit": 1500.0, "open_tasks": 800.0}
+    budgets = {}
+    for item in (raw or "").split(","):
+        if "=" in item:
+            label, limit = item.split("=", 1)
+            budgets[label.strip()] = float(limit)
+    return budgets
+
+
+class BrowserMetricsLog:
+    """Session-wide list of browser metric samples, written to qa-reports at the end of the run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = []
+
+    def add(self, sample):
+        with self._lock:
+            self._samples.append(sample)
+
+    def samples(self):
+        with self._lock:
+            return list(self._samples)
+
+    def summary(self):
+        by_label = {}
+        for sample in self.samples():
+            entry = by_label.setdefault(sample["label"], {"count": 0, "max_ms": 0.0, "total_ms": 0.0, "budget_exceeded": 0})
+            entry["count"] += 1
+            entry["total_ms"] += sample["duration_ms"]
+            entry["max_ms"] = max(entry["max_ms"], sample["duration_ms"])
+            entry["budget_exceeded"] += 1 if sample.get("budget_exceeded") else 0
+        for entry in by_label.values():
+            entry["mean_ms"] = round(entry.pop("total_ms") / entry["count"], 1)
+            entry["max_ms"] = round(entry["max_ms"], 1)
+        return by_label
+
+
+class BrowserMetrics:
+    """
+    Captures Navigation Timing, paint timings, long tasks and JS heap size around page-object
+    methods. Each sample is attached to the current allure step and checked against the
+    UI_PERF_BUDGETS budget for its label (warn only unless UI_PERF_BUDGET_ENFORCE=true).
+    """
+
+    def __init__(self, page, log, enabled=True, budgets=None, enforce=False):
+        self.page = page
+        self.log = log
+        self.enabled = enabled
+        self.budgets = budgets or {}
+        self.enforce = enforce
+        self.samples = []
+        self._installed = False
+        self._marks = {}
+
+    @classmethod
+    def from_env(cls, page, log):
+        return cls(
+            page,
+            log,
+            enabled=os.getenv("UI_BROWSER_METRICS", "true").lower() != "false",
+            budgets=parse_budgets(os.getenv("UI_PERF_BUDGETS")),
+            enforce=os.getenv("UI_PERF_BUDGET_ENFORCE", "false").lower() == "true",
+        )
+
+    def _install(self):
+        if self._installed:
+            return
+        self._installed = True
+        self.page.add_init_script(script=INSTALL_SCRIPT)
+        try:
+            self.page.evaluate(INSTALL_SCRIPT)
+        except PlaywrightError:
+            pass
+
+    def mark(self, name):
+        """Remember a starting point (e.g. login submitted) that a later measurement can time from."""
+        self._marks[name] = time.perf_counter()
+
+    def _collect(self, since, navigation):
+        try:
+            return self.page.evaluate(COLLECT_SCRIPT, [since, navigation])
+        except PlaywrightError:
+            return {}
+
+    def _page_now(self):
+        try:
+            return self.page.evaluate("() => performance.now()")
+        except PlaywrightError:
+            return 0
+
+    def record(self, label, started, page_started, navigation):
+        metrics = self._collect(0 if navigation else page_started, navigation)
+        sample = {"label": label, "duration_ms": round((time.perf_counter() - started) * 1000, 1), **metrics}
+        budget = self.budgets.get(label)
+        if budget is not None:
+            sample["budget_ms"] = budget
+            sample["budget_exceeded"] = sample["duration_ms"] > budget
+        self.samples.append(sample)
+        self.log.add(sample)
+        allure.attach(json.dumps(sample, indent=2), name=f"Browser metrics: {label}",
+                      attachment_type=allure.attachment_type.JSON)
+        if self.enforce and sample.get("budget_exceeded"):
+            self.assert_budget(label, budget)
+        return sample
+
+    def last(self, label):
+        for sample in reversed(self.samples):
+            if sample["label"] == label:
+                return sample
+        return None
+
+    def assert_budget(self, label, budget_ms):
+        sample = self.last(label)
+        if sample is None:
+            raise AssertionError(f"No browser metrics recorded for '{label}'.")
+        if sample["duration_ms"] > budget_ms:
+            raise AssertionError(
+                f"'{label}' took {sample['duration_ms']:.0f} ms, budget is {budget_ms:.0f} ms. "
+                f"Long tasks: {sample.get('longTasks')}"
+            )
+
+
+def measured(label, navigation=False, since_mark=None):
+    """
+    Decorate a page-object method so its duration and the browser's metrics are recorded as `label`.
+
+    since_mark times from an earlier BrowserMetrics.mark() instead of the call itself, e.g. from
+    login submission to the logged-in view.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.browser_metrics
+            if not metrics.enabled:
+                return method(self, *args, **kwargs)
+            metrics._install()
+            started = metrics._marks.pop(since_mark, None) or time.perf_counter()
+            page_started = 0 if navigation else metrics._page_now()
+            result = method(self, *args, **kwargs)
+            metrics.record(label, started, page_started, navigation)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+_default_log = BrowserMetricsLog()
+
+
+def get_default_metrics_log():
+    return _default_log
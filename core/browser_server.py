@@ -0,0 +1,236 @@
+"""
+Long-lived Chromium server shared by consecutive pytest runs.
+
+    python -m core.browser_server start [--headed]   # spawn in the background, wait until ready
+    python -m core.browser_server status
+    python -m core.browser_server stop               # graceful: the server polls for a stop file
+
+The server writes its websocket endpoint to .qa-cache/browser-server/endpoint.json; the `browser`
+fixture connects to it when UI_BROWSER_SERVER=on (or starts it first with UI_BROWSER_SERVER=auto)
+and falls back to a local launch if the server is missing or unhealthy. Tests only ever get fresh
+contexts, and contexts a client created are closed by the server when that client disconnects.
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from playwright.sync_api import Error as PlaywrightError, sync_playwright
+
+from core.paths import cache_dir
+
+
+SERVER_TITLE = "python-qa-framework"
+START_TIMEOUT_SECONDS = 30
+STOP_TIMEOUT_SECONDS = 15
+HEALTH_CHECK_SECONDS = 5
+POLL_SECONDS = 0.5
+
+
+def endpoint_file():
+    return os.path.join(cache_dir("browser-server"), "endpoint.json")
+
+
+def stop_file():
+    """Created by stop(); the serve loop polls for it. Works on Windows, where SIGTERM cannot be caught."""
+    return os.path.join(cache_dir("browser-server"), "stop")
+
+
+def read_endpoint():
+    try:
+        with open(endpoint_file(), encoding="utf-8") as source:
+            return json.load(source)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_endpoint(info):
+    tmp_path = f"{endpoint_file()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as target:
+        json.dump(info, target, indent=2)
+    os.replace(tmp_path, endpoint_file())
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows.
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def serve(headless=True, host="127.0.0.1"):
+    """Run the server in the foreground, relaunching Chromium whenever it crashes."""
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    if os.path.exists(stop_file()):
+        os.remove(stop_file())
+
+    def stop_requested():
+        if os.path.exists(stop_file()):
+            stopping.append(True)
+        return bool(stopping)
+
+    with sync_playwright() as playwright:
+        while not stopping:
+            browser = playwright.chromium.launch(headless=headless)
+            bound = browser.bind(SERVER_TITLE, host=host, port=0)
+            _write_endpoint({
+                "endpoint": bound["endpoint"],
+                "pid": os.getpid(),
+                "headless": headless,
+                "browser_version": browser.version,
+                "started_at": time.time(),
+            })
+            print(f"Browser server listening on {bound['endpoint']}", flush=True)
+            try:
+                # The sync API only notices a dead browser while a call is in flight, so probe it.
+                next_check = 0.0
+                while not stop_requested():
+                    if time.monotonic() >= next_check:
+                        if not _healthy(browser):
+                            break
+                        next_check = time.monotonic() + HEALTH_CHECK_SECONDS
+                    time.sleep(POLL_SECONDS)
+            except KeyboardInterrupt:
+                stopping.append(True)
+            if stopping:
+                browser.unbind()
+                browser.close()
+            else:
+                print("Browser stopped answering; relaunching.", flush=True)
+                try:
+                    browser.close()
+                except PlaywrightError:
+                    pass
+
+    info = read_endpoint()
+    if info and info.get("pid") == os.getpid():
+        os.remove(endpoint_file())
+    if os.path.exists(stop_file()):
+        os.remove(stop_file())
+
+
+def start(headless=True):
+    info = read_endpoint()
+    if info and _pid_alive(info["pid"]):
+        return info
+    log_path = os.path.join(cache_dir("browser-server"), "server.log")
+    command = [sys.executable, "-m", "core.browser_server", "serve"] + ([] if headless else ["--headed"])
+    # Detach from the caller's terminal so Ctrl+C in a pytest run does not take the server down.
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
+    with open(log_path, "ab") as log:
+        process = subprocess.Popen(
+            command,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            **detach,
+        )
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        info = read_endpoint()
+        if info and info["pid"] == process.pid:
+            return info
+        if process.poll() is not None:
+            raise RuntimeError(f"Browser server exited with code {process.returncode}; see {log_path}")
+        time.sleep(0.2)
+    raise RuntimeError(f"Browser server did not come up within {START_TIMEOUT_SECONDS}s; see {log_path}")
+
+
+def stop():
+    """Ask the server to shut down cleanly (closing Chromium and the driver); kill it only if it does not."""
+    info = read_endpoint()
+    if not info:
+        return False
+    if not _pid_alive(info["pid"]):
+        os.remove(endpoint_file())
+        return True
+    with open(stop_file(), "w", encoding="utf-8") as target:
+        target.write(str(info["pid"]))
+    deadline = time.monotonic() + STOP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if not _pid_alive(info["pid"]):
+            return True
+        time.sleep(0.2)
+    # On Windows this is TerminateProcess: no cleanup runs, so it is only the last resort.
+    os.kill(info["pid"], signal.SIGTERM)
+    return True
+
+
+def _healthy(browser):
+    try:
+        browser.new_context().close()
+        return True
+    except PlaywrightError:
+        return False
+
+
+def connect_or_launch(playwright, headless, slow_mo=0, mode=None):
+    """
+    Return (browser, source) where source is "server" or "local".
+
+    mode "off": always launch locally; "on": use a running server, otherwise launch locally;
+    "auto": start the server first if none is running.
+    """
+    mode = mode or os.getenv("UI_BROWSER_SERVER", "off")
+    if mode != "off":
+        info = read_endpoint()
+        if mode == "auto" and not (info and _pid_alive(info["pid"])):
+            try:
+                info = start(headless=headless)
+            except RuntimeError as error:
+                print(f"Browser server unavailable ({error}); launching locally.")
+                info = None
+        if info and _pid_alive(info["pid"]):
+            try:
+                browser = playwright.chromium.connect(info["endpoint"], slow_mo=slow_mo, timeout=10000)
+                if _healthy(browser):
+                    return browser, "server"
+                browser.close()
+            except PlaywrightError as error:
+                print(f"Could not connect to browser server at {info['endpoint']} ({error}); launching locally.")
+    return playwright.chromium.launch(headless=headless, slow_mo=slow_mo), "local"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.browser_server", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=("start", "serve", "status", "stop"))
+    parser.add_argument("--headed", action="store_true", help="Show the browser window.")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(headless=not args.headed)
+    elif args.command == "start":
+        print(json.dumps(start(headless=not args.headed), indent=2))
+    elif args.command == "stop":
+        print("Stopping browser server." if stop() else "No browser server running.")
+    else:
+        info = read_endpoint()
+        running = bool(info and _pid_alive(info["pid"]))
+        print(json.dumps({"running": running, **(info or {})}, indent=2))
+        return 0 if running else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
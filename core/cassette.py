@@ -0,0 +1,206 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+KEPT_HEADERS = ("content-type", "x-pagination-total", "x-pagination-pages", "x-pagination-page", "x-pagination-limit")
+ITEM_PATH = re.compile(r"^(?P<collection>.+)/(?P<id>\d+)$")
+
+
+def body_hash(body):
+    if body in (None, b"", ""):
+        return ""
+    if isinstance(body, (bytes, str)):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            raw = body.encode("utf-8") if isinstance(body, str) else body
+            return hashlib.sha256(raw).hexdigest()[:16]
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _path_with_query(url):
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+class Cassette:
+    """
+    Recorded APIClient traffic stored as gzip'd JSON lines, indexed by
+    (method, path+query, request body hash). Repeated identical requests are
+    replayed in recorded order; the last recorded response then sticks.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = []
+        self._index = {}
+        self._templates = {}
+
+    @classmethod
+    def load(cls, path):
+        cassette = cls(path)
+        with gzip.open(path, "rt", encoding="utf-8") as source:
+            for line in source:
+                if line.strip():
+                    cassette._add(json.loads(line))
+        return cassette
+
+    def _add(self, entry):
+        self._entries.append(entry)
+        key = (entry["method"], entry["path"], entry["body_hash"])
+        self._index.setdefault(key, deque()).append(entry)
+        self._templates.setdefault((entry["method"], entry["path"]), entry)
+
+    def record(self, method, request_body, response):
+        entry = {
+            "method": method,
+            "path": _path_with_query(response.url),
+            "body_hash": body_hash(request_body),
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+            "body": response.text,
+        }
+        with self._lock:
+            self._add(entry)
+
+    def lookup(self, method, path, request_hash):
+        with self._lock:
+            responses = self._index.get((method, path, request_hash))
+            if not responses:
+                return None
+            return responses.popleft() if len(responses) > 1 else responses[0]
+
+    def template(self, method, path):
+        with self._lock:
+            return self._templates.get((method, path))
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, gzip.open(self.path, "wt", encoding="utf-8") as target:
+            for entry in self._entries:
+                target.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+class _ResourceState:
+    """
+    Minimal create/read/delete state for ids minted during replay, so flows like
+    POST -> DELETE (204) -> GET (404) behave as they did against the live API.
+    """
+
+    def __init__(self, first_id=900000000):
+        self._lock = threading.Lock()
+        self._next_id = first_id
+        self._items = {}
+        self._deleted = set()
+
+    def create(self, collection, payload, template):
+        with self._lock:
+            self._next_id += 1
+            item = dict(json.loads(template["body"])) if template else {}
+            item.update(payload or {})
+            item["id"] = self._next_id
+            self._items[(collection, self._next_id)] = item
+            return item
+
+    def get(self, collection, item_id):
+        with self._lock:
+            if (collection, item_id) in self._deleted:
+                return "deleted"
+            return self._items.get((collection, item_id))
+
+    def delete(self, collection, item_id):
+        with self._lock:
+            if self._items.pop((collection, item_id), None) is None:
+                return False
+            self._deleted.add((collection, item_id))
+            return True
+
+
+class CassetteServer:
+    """In-process HTTP stand-in that serves a Cassette on 127.0.0.1."""
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+        self.state = _ResourceState()
+        handler = type("CassetteHandler", (_CassetteHandler,), {"server_ref": self})
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="cassette-server", daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def respond(self, method, path, raw_body):
+        request_hash = body_hash(raw_body)
+        match = ITEM_PATH.match(urlsplit(path).path)
+
+        if match:
+            collection, item_id = match.group("collection"), int(match.group("id"))
+            item = self.state.get(collection, item_id)
+            if item is not None:
+                if item == "deleted":
+                    return 404, {}, json.dumps({"message": "Resource not found"})
+                if method == "DELETE":
+                    self.state.delete(collection, item_id)
+                    return 204, {}, ""
+                if method == "GET":
+                    return 200, {"Content-Type": "application/json"}, json.dumps(item)
+
+        entry = self.cassette.lookup(method, path, request_hash)
+        if entry is not None:
+            return entry["status"], entry["headers"], entry["body"]
+
+        if method == "POST" and not match:
+            template = self.cassette.template("POST", path)
+            if template is not None and template["status"] == 201:
+                item = self.state.create(path, json.loads(raw_body or b"{}"), template)
+                return 201, template["headers"], json.dumps(item)
+
+        return 501, {"Content-Type": "application/json"}, json.dumps(
+            {"message": f"No cassette entry for {method} {path}"}
+        )
+
+
+class _CassetteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_ref = None
+
+    def _serve(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        status, headers, body = self.server_ref.respond(self.command, self.path, raw_body)
+        data = body.encode("utf-8")
+
+        self.send_response(status)
+        for name, value in headers.items():
+            if name.lower() != "content-length":
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _serve
+    do_POST = _serve
+    do_PUT = _serve
+    do_PATCH = _serve
+    do_DELETE = _serve
+
+    def log_message(self, format, *args):
+        pass
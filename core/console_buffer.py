@@ -0,0 +1,71 @@
+import os
+import time
+from collections import deque
+
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+CONSOLE_TYPE_LEVELS = {
+    "debug": "debug",
+    "trace": "debug",
+    "profile": "debug",
+    "profileEnd": "debug",
+    "count": "debug",
+    "timeEnd": "debug",
+    "warning": "warning",
+    "error": "error",
+    "assert": "error",
+}
+
+
+class ConsoleBuffer:
+    """
+    Bounded in-memory capture of one page's console messages and uncaught page errors.
+
+    Messages below min_level are skipped; when the buffer is full the oldest entry is evicted
+    and counted in `dropped`, so a chatty page costs a fixed amount of memory and no I/O.
+    """
+
+    def __init__(self, name, size=200, min_level="info"):
+        if min_level not in LEVELS:
+            raise ValueError(f"Unknown console level: {min_level}. Expected one of {tuple(LEVELS)}")
+        self.name = name
+        self.entries = deque(maxlen=size)
+        self.min_level = LEVELS[min_level]
+        self.dropped = 0
+        self.filtered = 0
+        self._started = time.monotonic()
+
+    @classmethod
+    def from_env(cls, name):
+        return cls(
+            name,
+            size=int(os.getenv("UI_CONSOLE_BUFFER_SIZE", "200")),
+            min_level=os.getenv("UI_CONSOLE_LEVEL", "info"),
+        )
+
+    def _append(self, kind, text):
+        if len(self.entries) == self.entries.maxlen:
+            self.dropped += 1
+        self.entries.append((time.monotonic() - self._started, kind, text))
+
+    def on_console(self, message):
+        level = CONSOLE_TYPE_LEVELS.get(message.type, "info")
+        if LEVELS[level] < self.min_level:
+            self.filtered += 1
+            return
+        self._append(message.type, message.text)
+
+    def on_page_error(self, error):
+        self._append("pageerror", str(error))
+
+    def watch(self, page):
+        page.on("console", self.on_console)
+        page.on("pageerror", self.on_page_error)
+        return self
+
+    def format(self):
+        lines = [f"[{self.name}] {len(self.entries)} entries, {self.dropped} dropped (buffer full), {self.filtered} below level"]
+        for offset, kind, text in self.entries:
+            prefix = "PAGE ERROR" if kind == "pageerror" else f"BROWSER LOG: {kind}"
+            lines.append(f"+{offset:8.3f}s {prefix} {text}")
+        return "\n".join(lines)
@@ -0,0 +1,112 @@
+import os
+import time
+from collections import deque
+
+from core.network_profile import NetworkProfile
+
+
+EMPTY_STORAGE_STATE = {"cookies": [], "origins": []}
+
+
+class ContextPool:
+    """
+    Keeps browser contexts warm across tests.
+    reset_strategy "clear" wipes cookies, storage, permissions, routes and pages in place;
+    "recreate" closes the context and opens a fresh one (the old per-test behavior).
+    Release clears routes, so the network profile is (re)applied on every acquire.
+    A warm context's HTTP cache only helps while no route is installed: once the profile (or a
+    HAR archive) routes the context, Chromium's cache is disabled for it. Set UI_NETWORK_PROFILE=off
+    to keep cached assets across tests instead.
+    """
+
+    RESET_STRATEGIES = ("clear", "recreate")
+
+    def __init__(self, browser, size=2, reset_strategy="clear", network_profile=None):
+        if reset_strategy not in self.RESET_STRATEGIES:
+            raise ValueError(f"Unknown context reset strategy: {reset_strategy}. Expected one of {self.RESET_STRATEGIES}")
+        self.browser = browser
+        self.size = size
+        self.reset_strategy = reset_strategy
+        self.network_profile = network_profile or NetworkProfile()
+        self._idle = deque()
+        self._acquire_ms = []
+        self._reset_ms = []
+        self._warm_hits = 0
+        self._cold_creates = 0
+
+    @classmethod
+    def from_env(cls, browser):
+        enabled = os.getenv("UI_CONTEXT_POOL", "true").lower() != "false"
+        return cls(
+            browser,
+            size=int(os.getenv("UI_CONTEXT_POOL_SIZE", "2")) if enabled else 0,
+            reset_strategy=os.getenv("UI_CONTEXT_RESET", "clear"),
+            network_profile=NetworkProfile.from_env(),
+        )
+
+    def warm_up(self):
+        while len(self._idle) < self.size:
+            self._idle.append(self.browser.new_context())
+        return self
+
+    def acquire(self, storage_state=None, network_allow=()):
+        started = time.perf_counter()
+        if self._idle:
+            context = self._idle.popleft()
+            self._warm_hits += 1
+            if storage_state:
+                context.set_storage_state(storage_state)
+        else:
+            context = self.browser.new_context(storage_state=storage_state)
+            self._cold_creates += 1
+        self.network_profile.apply(context, allow=network_allow)
+        self._acquire_ms.append((time.perf_counter() - started) * 1000)
+        return context
+
+    def release(self, context):
+        if len(self._idle) >= self.size or self.reset_strategy == "recreate":
+            context.close()
+            if len(self._idle) < self.size:
+                self._idle.append(self.browser.new_context())
+            return
+
+        started = time.perf_counter()
+        try:
+            for page in list(context.pages):
+                page.close()
+            context.unroute_all(behavior="ignoreErrors")
+            context.clear_permissions()
+            context.set_extra_http_headers({})
+            context.set_storage_state(EMPTY_STORAGE_STATE)
+        except Exception:
+            # A context that cannot be reset is not safe to hand out again.
+            context.close()
+            self._idle.append(self.browser.new_context())
+            return
+        self._reset_ms.append((time.perf_counter() - started) * 1000)
+        self._idle.append(context)
+
+    def metrics(self):
+        def _stats(samples):
+            if not samples:
+                return {"count": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+            ordered = sorted(samples)
+            return {
+                "count": len(ordered),
+                "mean_ms": round(sum(ordered) / len(ordered), 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 1),
+                "max_ms": round(ordered[-1], 1),
+            }
+
+        return {
+            "size": self.size,
+            "reset_strategy": self.reset_strategy,
+            "warm_hits": self._warm_hits,
+            "cold_creates": self._cold_creates,
+            "acquire": _stats(self._acquire_ms),
+            "reset": _stats(self._reset_ms),
+        }
+
+    def close(self):
+        while self._idle:
+            self._idle.popleft().close()
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import socket
+import time
+import uuid
+
+from core.paths import cache_dir
+
+
+class CredentialLease:
+    def __init__(self, account, lock_path, token):
+        self.account = account
+        self.lock_path = lock_path
+        self.token = token
+
+    @property
+    def email(self):
+        return self.account["email"]
+
+    @property
+    def password(self):
+        return self.account["password"]
+
+
+class CredentialPool:
+    """
+    Parent accounts (each owning its own family) handed out exclusively across processes.
+
+    A lease is a lock file created with O_CREAT | O_EXCL in .qa-cache/credential-leases, so two
+    pytest processes - or two --ui-workers workers - can never hold the same account. A lock older
+    than lease_seconds is considered abandoned (crashed run) and may be taken over.
+
+    Accounts come from UI_CREDENTIAL_POOL_FILE (JSON list of {"email", "password", ...}) or
+    UI_CREDENTIAL_POOL ("email:password,email:password"); without either the pool holds only
+    the default parent account.
+    """
+
+    def __init__(self, accounts, lock_dir=None, lease_seconds=1800, wait_seconds=300, poll_seconds=1.0):
+        if not accounts:
+            raise ValueError("Credential pool is empty.")
+        self.accounts = list(accounts)
+        self.lock_dir = lock_dir or cache_dir("credential-leases")
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+
+    @classmethod
+    def from_env(cls, default_account):
+        path = os.getenv("UI_CREDENTIAL_POOL_FILE")
+        inline = os.getenv("UI_CREDENTIAL_POOL")
+        if path:
+            with open(path, encoding="utf-8") as source:
+                accounts = json.load(source)
+        elif inline:
+            accounts = [
+                {"email": email.strip(), "password": password}
+                for email, password in (item.split(":", 1) for item in inline.split(",") if item.strip())
+            ]
+        else:
+            accounts = [default_account]
+        return cls(
+            accounts,
+            lease_seconds=int(os.getenv("UI_CREDENTIAL_LEASE_SECONDS", "1800")),
+            wait_seconds=int(os.getenv("UI_CREDENTIAL_LEASE_WAIT", "300")),
+        )
+
+    def _lock_path(self, account):
+        digest = hashlib.sha256(account["email"].lower().encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.lock_dir, f"{digest}.lock")
+
+    def _expired(self, lock_path):
+        try:
+            with open(lock_path, encoding="utf-8") as source:
+                expires_at = json.load(source)["expires_at"]
+        except (OSError, ValueError, KeyError):
+            # Half-written or unreadable: fall back to the file's age.
+            try:
+                expires_at = os.path.getmtime(lock_path) + self.lease_seconds
+            except OSError:
+                return True
+        return expires_at < time.time()
+
+    def _take_over(self, lock_path):
+        # Move the stale lock aside atomically; if another process replaced it with a live lease
+        # between our check and the rename, put that lease back.
+        stale_path = f"{lock_path}.{uuid.uuid4().hex}.stale"
+        try:
+            os.rename(lock_path, stale_path)
+        except OSError:
+            return
+        if not self._expired(stale_path):
+            try:
+                os.link(stale_path, lock_path)
+            except OSError:
+                pass
+        os.remove(stale_path)
+
+    def _try_lock(self, account):
+        lock_path = self._lock_path(account)
+        if os.path.exists(lock_path) and self._expired(lock_path):
+            self._take_over(lock_path)
+        try:
+            descriptor = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+        token = uuid.uuid4().hex
+        with os.fdopen(descriptor, "w", encoding="utf-8") as target:
+            json.dump({
+                "token": token,
+                "email": account["email"],
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+                "worker": os.getenv("QA_WORKER_ID", ""),
+                "leased_at": time.time(),
+                "expires_at": time.time() + self.lease_seconds,
+            }, target)
+        return CredentialLease(account, lock_path, token)
+
+    def acquire(self):
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            for account in self.accounts:
+                lease = self._try_lock(account)
+                if lease is not None:
+                    return lease
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"No free account in the credential pool ({len(self.accounts)} accounts) "
+                    f"after {self.wait_seconds}s. Leases live in {self.lock_dir}."
+                )
+            time.sleep(self.poll_seconds)
+
+    def release(self, lease):
+        try:
+            with open(lease.lock_path, encoding="utf-8") as source:
+                owner = json.load(source).get("token")
+        except (OSError, ValueError):
+            return
+        # Only remove our own lock; an expired lease may already belong to someone else.
+        if owner == lease.token:
+            os.remove(lease.lock_path)
@@ -0,0 +1,121 @@
+import time
+
+from playwright.sync_api import Error as PlaywrightError
+
+
+INSTALL_SCRIPT = """(kinds) => {
+    if (!window.__qaDomIndex) {
+        const entries = {};
+        const selectors = {};
+        let waiters = [];
+
+        const textOf = (el) => el.textContent || '';
+
+        const addKind = (kind, selector) => {
+            if (selectors[kind]) return;
+            selectors[kind] = selector;
+            entries[kind] = new Map();
+            document.querySelectorAll(selector).forEach((el) => entries[kind].set(el, textOf(el)));
+        };
+
+        const has = (kind, text) => {
+            for (const value of entries[kind].values()) {
+                if (value.includes(text)) return true;
+            }
+            return false;
+        };
+
+        const settle = () => {
+            waiters = waiters.filter((waiter) => {
+                if (has(waiter.kind, waiter.text) !== waiter.present) return true;
+                clearTimeout(waiter.timer);
+                waiter.resolve(true);
+                return false;
+            });
+        };
+
+        const touch = (node) => {
+            const el = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+            if (!el) return;
+            for (const kind of Object.keys(selectors)) {
+                const card = el.closest(selectors[kind]);
+                if (card) entries[kind].set(card, textOf(card));
+            }
+        };
+
+        const observer = new MutationObserver((records) => {
+            for (const record of records) {
+                for (const node of record.removedNodes) {
+                    if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                    for (const kind of Object.keys(selectors)) {
+                        for (const el of entries[kind].keys()) {
+                            if (el === node || node.contains(el)) entries[kind].delete(el);
+                        }
+                    }
+                }
+                for (const node of record.addedNodes) {
+                    touch(node);
+                    if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                    for (const kind of Object.keys(selectors)) {
+                        node.querySelectorAll(selectors[kind]).forEach((el) => entries[kind].set(el, textOf(el)));
+                    }
+                }
+                touch(record.target);
+            }
+            settle();
+        });
+        observer.observe(document.documentElement, { childList: true, subtree: true, characterData: true });
+
+        window.__qaDomIndex = {
+            addKind,
+            has,
+            waitFor(kind, text, present, timeoutMs) {
+                if (has(kind, text) === present) return Promise.resolve(true);
+                return new Promise((resolve) => {
+                    const waiter = { kind, text, present, resolve };
+                    waiter.timer = setTimeout(() => {
+                        waiters = waiters.filter((other) => other !== waiter);
+                        resolve(false);
+                    }, timeoutMs);
+                    waiters.push(waiter);
+                });
+            },
+        };
+    }
+    for (const [kind, selector] of Object.entries(kinds)) window.__qaDomIndex.addKind(kind, selector);
+}"""
+
+
+class DomIndex:
+    """
+    In-page MutationObserver that indexes elements of interest (task cards, messages, ...)
+    by kind with their text, so waits resolve on DOM mutations instead of re-scanning the
+    document on every polling tick.
+    """
+
+    def __init__(self, page, kinds):
+        self.page = page
+        self.kinds = dict(kinds)
+
+    def install(self):
+        self.page.evaluate(INSTALL_SCRIPT, self.kinds)
+
+    def has(self, kind, text):
+        self.install()
+        return self.page.evaluate("([kind, text]) => window.__qaDomIndex.has(kind, text)", [kind, text])
+
+    def wait_for(self, kind, text, present=True, timeout=30000):
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+            try:
+                self.install()
+                return self.page.evaluate(
+                    "([kind, text, present, ms]) => window.__qaDomIndex.waitFor(kind, text, present, ms)",
+                    [kind, text, present, remaining_ms],
+                )
+            except PlaywrightError:
+                # A navigation or reload destroyed the observer; reinstall it in the new document.
+                if remaining_ms == 0:
+                    return False
+                self.page.wait_for_load_state("domcontentloaded")
@@ -0,0 +1,201 @@
+import base64
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core.cassette import body_hash
+from core.network_profile import glob_to_regex
+
+
+DEFAULT_URL_PATTERNS = ("*googleapis.com/*", "*firebaseio.com/*", "*firebaseapp.com/*", "*gstatic.com/*")
+# Firestore/WebChannel cache-busters and session counters that differ between record and replay.
+DEFAULT_IGNORED_PARAMS = ("zx", "t", "_", "gsessionid", "SID", "RID", "AID", "ofs", "CI", "TYPE")
+# Long-lived streaming / hanging-GET channels (Firestore WebChannel). route.fetch() buffers a whole
+# response before it can be fulfilled, so recording these would stall the page; they bypass the archive.
+DEFAULT_STREAMING_PATTERNS = ("*/Listen/channel*", "*/Write/channel*")
+DROPPED_RESPONSE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def _split(raw, default):
+    items = tuple(item.strip() for item in (raw or "").split(",") if item.strip())
+    return items or default
+
+
+class HarArchive:
+    """
+    Backend traffic of one test stored as a HAR 1.2 file (viewable in browser dev tools).
+
+    Record mode proxies matching requests with route.fetch() and keeps the responses; this works
+    on pooled contexts, unlike record_har_path which only writes the file when the context closes.
+    Replay mode fulfills requests from three dict indexes, most specific first:
+    (method, normalized url, body hash) -> (method, normalized url) -> (method, path).
+    Repeated requests are served in recorded order; the last response then sticks.
+    Normalized urls drop volatile query params (UI_HAR_IGNORE_PARAMS).
+
+    Streaming channels (UI_HAR_STREAMING_PATTERNS) are not archived: record mode lets them through
+    to the network untouched and replay mode aborts them, so replay only covers request/response
+    traffic and data the app receives over a streaming listener is not available offline.
+    """
+
+    MODES = ("off", "record", "replay")
+
+    def __init__(self, path, mode, url_patterns=DEFAULT_URL_PATTERNS, ignored_params=DEFAULT_IGNORED_PARAMS,
+                 streaming_patterns=DEFAULT_STREAMING_PATTERNS):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown HAR mode: {mode}. Expected one of {self.MODES}")
+        self.path = path
+        self.mode = mode
+        self.matcher = re.compile("|".join(f"(?:{glob_to_regex(pattern)})" for pattern in url_patterns))
+        self.ignored_params = set(ignored_params)
+        self.streaming = (
+            re.compile("|".join(f"(?:{glob_to_regex(pattern)})" for pattern in streaming_patterns))
+            if streaming_patterns else None
+        )
+        self._lock = threading.Lock()
+        self._entries = []
+        self._indexes = ({}, {}, {})
+        self.served = 0
+        self.streamed = 0
+        self.unmatched = []
+
+    @classmethod
+    def from_env(cls, path):
+        return cls(
+            path,
+            os.getenv("UI_HAR_MODE", "off"),
+            url_patterns=_split(os.getenv("UI_HAR_URL_PATTERNS"), DEFAULT_URL_PATTERNS),
+            ignored_params=_split(os.getenv("UI_HAR_IGNORE_PARAMS"), DEFAULT_IGNORED_PARAMS),
+            streaming_patterns=_split(os.getenv("UI_HAR_STREAMING_PATTERNS"), DEFAULT_STREAMING_PATTERNS),
+        )
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as source:
+            for entry in json.load(source)["log"]["entries"]:
+                self._index(entry)
+        return self
+
+    def _normalize(self, url):
+        parts = urlsplit(url)
+        query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key not in self.ignored_params]
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), ""))
+
+    def _keys(self, method, url, post_data):
+        return (
+            (method, self._normalize(url), body_hash(post_data)),
+            (method, self._normalize(url)),
+            (method, urlsplit(url).netloc + urlsplit(url).path),
+        )
+
+    def _index(self, entry):
+        request = entry["request"]
+        post_data = request.get("postData", {}).get("text")
+        self._entries.append(entry)
+        for index, key in zip(self._indexes, self._keys(request["method"], request["url"], post_data)):
+            index.setdefault(key, deque()).append(entry)
+
+    def attach(self, context):
+        if self.mode == "record":
+            context.route(self.matcher, self._record)
+        elif self.mode == "replay":
+            context.route(self.matcher, self._replay)
+
+    def _is_streaming(self, url):
+        return self.streaming is not None and self.streaming.search(url) is not None
+
+    def _record(self, route):
+        request = route.request
+        if self._is_streaming(request.url):
+            with self._lock:
+                self.streamed += 1
+            route.continue_()
+            return
+        started = time.perf_counter()
+        started_at = datetime.now(timezone.utc).isoformat()
+        response = route.fetch()
+        body = response.body()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        route.fulfill(response=response, body=body)
+
+        post_data = request.post_data
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in DROPPED_RESPONSE_HEADERS}
+        try:
+            content = {"size": len(body), "mimeType": headers.get("content-type", ""), "text": body.decode("utf-8")}
+        except UnicodeDecodeError:
+            content = {"size": len(body), "mimeType": headers.get("content-type", ""),
+                       "text": base64.b64encode(body).decode("ascii"), "encoding": "base64"}
+        entry = {
+            "startedDateTime": started_at,
+            "time": round(elapsed_ms, 1),
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "headers": [],
+                "postData": {"mimeType": request.headers.get("content-type", ""), "text": post_data} if post_data else {},
+            },
+            "response": {
+                "status": response.status,
+                "statusText": response.status_text,
+                "headers": [{"name": name, "value": value} for name, value in headers.items()],
+                "content": content,
+            },
+        }
+        with self._lock:
+            self._index(entry)
+
+    def lookup(self, method, url, post_data):
+        with self._lock:
+            for index, key in zip(self._indexes, self._keys(method, url, post_data)):
+                responses = index.get(key)
+                if responses:
+                    return responses.popleft() if len(responses) > 1 else responses[0]
+        return None
+
+    def _replay(self, route):
+        request = route.request
+        if self._is_streaming(request.url):
+            with self._lock:
+                self.streamed += 1
+            route.abort("internetdisconnected")
+            return
+        entry = self.lookup(request.method, request.url, request.post_data)
+        if entry is None:
+            with self._lock:
+                self.unmatched.append(f"{request.method} {request.url}")
+            route.abort("internetdisconnected")
+            return
+        content = entry["response"]["content"]
+        body = content.get("text", "")
+        body = base64.b64decode(body) if content.get("encoding") == "base64" else body.encode("utf-8")
+        with self._lock:
+            self.served += 1
+        route.fulfill(
+            status=entry["response"]["status"],
+            headers={header["name"]: header["value"] for header in entry["response"]["headers"]},
+            body=body,
+        )
+
+    def save(self):
+        if self.mode != "record" or not self._entries:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        archive = {"log": {"version": "1.2", "creator": {"name": "python-qa-framework", "version": "1"}, "entries": self._entries}}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as target:
+            json.dump(archive, target)
+        os.replace(tmp_path, self.path)
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "entries": len(self._entries),
+            "served": self.served,
+            "streaming_bypassed": self.streamed,
+            "unmatched": len(self.unmatched),
+            "unmatched_requests": self.unmatched[:50],
+        }
@@ -0,0 +1,123 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = (502, 503, 504)
+
+
+class PoolConfig:
+
+    def __init__(
+        self,
+        pool_connections=4,
+        pool_maxsize=16,
+        keep_alive=True,
+        connect_timeout=5.0,
+        read_timeout=30.0,
+        retries=3,
+        backoff_factor=0.5,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            pool_connections=int(os.getenv("API_POOL_CONNECTIONS", "4")),
+            pool_maxsize=int(os.getenv("API_POOL_MAXSIZE", "16")),
+            keep_alive=os.getenv("API_KEEP_ALIVE", "true").lower() != "false",
+            connect_timeout=float(os.getenv("API_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("API_READ_TIMEOUT", "30")),
+            retries=int(os.getenv("API_RETRIES", "3")),
+            backoff_factor=float(os.getenv("API_RETRY_BACKOFF", "0.5")),
+        )
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+
+class HTTPSessionPool:
+    """
+    One requests.Session with a pooled adapter shared by every APIClient in the process.
+    Only idempotent methods are retried; POST is never replayed.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or PoolConfig.from_env()
+        self.session = requests.Session()
+
+        retry = Retry(
+            total=self.config.retries,
+            connect=self.config.retries,
+            read=self.config.retries,
+            status=self.config.retries,
+            allowed_methods=IDEMPOTENT_METHODS,
+            status_forcelist=RETRY_STATUSES,
+            backoff_factor=self.config.backoff_factor,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            max_retries=retry,
+            pool_block=False,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._adapter = adapter
+
+        if not self.config.keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.config.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def stats(self):
+        hosts = {}
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            entry = hosts.setdefault(host, {"requests": 0, "new_connections": 0, "reused_connections": 0})
+            entry["requests"] += pool.num_requests
+            entry["new_connections"] += pool.num_connections
+            entry["reused_connections"] += max(0, pool.num_requests - pool.num_connections)
+        return hosts
+
+    def close(self):
+        self.session.close()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = HTTPSessionPool()
+        return _default_pool
+
+
+def close_default_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+            _default_pool = None
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import time
+
+import allure
+
+from core.parallel import worker_id
+from core.paths import cache_dir
+
+
+class JourneyStep:
+    def __init__(self, name, run, requires=()):
+        self.name = name
+        self.run = run
+        self.requires = tuple(requires)
+
+
+class CheckpointStore:
+    """
+    One JSON file per completed step, newest wins for "last".
+
+    Files live under .qa-cache/journeys/<journey>/<owner hash>/<worker>/, so runs leasing other
+    accounts or running in other --ui-workers slots never load or clear each other's checkpoints.
+    """
+
+    def __init__(self, journey_name, owner=None, ttl_seconds=12 * 3600):
+        owner_key = hashlib.sha256((owner or "").strip().lower().encode("utf-8")).hexdigest()[:12] if owner else "shared"
+        self.directory = cache_dir("journeys", journey_name, owner_key, worker_id() or "main")
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, index, step_name):
+        return os.path.join(self.directory, f"{index:02d}-{step_name}.json")
+
+    def save(self, index, step_name, checkpoint):
+        path = self._path(index, step_name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as target:
+            json.dump({**checkpoint, "saved_at": time.time()}, target)
+        os.replace(tmp_path, path)
+
+    def load(self, index, step_name):
+        try:
+            with open(self._path(index, step_name), encoding="utf-8") as source:
+                checkpoint = json.load(source)
+        except (OSError, ValueError):
+            return None
+        if time.time() - checkpoint.get("saved_at", 0) > self.ttl_seconds:
+            return None
+        return checkpoint
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
+
+
+class Journey:
+    """
+    A long stateful test expressed as ordered steps with declared prerequisites.
+
+    After every step a checkpoint stores the completed step names, the journey state
+    (get_state()) and each actor's browser storage state. With UI_JOURNEY_RESUME=last, restore()
+    loads the newest checkpoint and run() continues after it; UI_JOURNEY_RESUME=<step name> loads
+    the checkpoint taken just before that step. Checkpoints are removed once the journey passes.
+    A resume is refused (fresh run instead) when the checkpoint is missing, expired, or belongs
+    to another account (owner).
+    """
+
+    def __init__(self, name, steps, actors, get_state, set_state, owner=None, store=None, resume=None,
+                 enabled=True):
+        names = [step.name for step in steps]
+        for step in steps:
+            unknown = [required for required in step.requires if required not in names[:names.index(step.name)]]
+            if unknown:
+                raise ValueError(f"Step '{step.name}' requires {unknown}, which do not run before it.")
+        self.name = name
+        self.steps = steps
+        self.actors = actors
+        self.get_state = get_state
+        self.set_state = set_state
+        self.owner = owner
+        self.store = store or CheckpointStore(
+            name, owner=owner, ttl_seconds=int(os.getenv("UI_JOURNEY_CHECKPOINT_TTL", "43200"))
+        )
+        self.resume = os.getenv("UI_JOURNEY_RESUME", "") if resume is None else resume
+        self.enabled = enabled and os.getenv("UI_JOURNEY_CHECKPOINTS", "true").lower() != "false"
+        self.completed = []
+
+    def _resume_checkpoint(self):
+        names = [step.name for step in self.steps]
+        if self.resume == "last":
+            for index in reversed(range(len(self.steps))):
+                checkpoint = self.store.load(index, names[index])
+                if checkpoint:
+                    return checkpoint
+            return None
+        if self.resume not in names:
+            raise ValueError(f"UI_JOURNEY_RESUME={self.resume} is not a step of {self.name}: {names}")
+        index = names.index(self.resume)
+        return self.store.load(index - 1, names[index - 1]) if index > 0 else None
+
+    def restore(self):
+        """
+        Apply the checkpoint selected by UI_JOURNEY_RESUME and return the steps it covers.
+        Call it before adding actors, so they are added with the restored context values.
+        """
+        if not (self.enabled and self.resume):
+            return []
+        checkpoint = self._resume_checkpoint()
+        if checkpoint is None or checkpoint.get("owner") != self.owner:
+            allure.attach(f"No usable checkpoint for resume={self.resume}; running from the first step.",
+                          name="Journey resume", attachment_type=allure.attachment_type.TEXT)
+            return []
+        self.set_state(checkpoint["state"])
+        self.actors.restore(checkpoint["storage"])
+        self.completed = list(checkpoint["completed"])
+        allure.attach(json.dumps(self.completed), name="Journey resumed after steps",
+                      attachment_type=allure.attachment_type.JSON)
+        return list(self.completed)
+
+    def _checkpoint(self, index, step):
+        self.store.save(index, step.name, {
+            "owner": self.owner,
+            "completed": self.completed,
+            "state": self.get_state(),
+            "storage": self.actors.storage_states(),
+        })
+
+    def run(self):
+        if self.enabled and not self.completed:
+            # Fresh run: checkpoints of an earlier run must not mix with this one's.
+            self.store.clear()
+        for index, step in enumerate(self.steps):
+            if step.name in self.completed:
+                with allure.step(f"{step.name} (restored from checkpoint)"):
+                    continue
+            missing = [required for required in step.requires if required not in self.completed]
+            if missing:
+                raise AssertionError(f"Cannot run '{step.name}': prerequisite steps {missing} did not complete.")
+            step.run()
+            self.completed.append(step.name)
+            if self.enabled:
+                self._checkpoint(index, step)
+        if self.enabled:
+            self.store.clear()
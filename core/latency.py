@@ -0,0 +1,104 @@
+import math
+import re
+import threading
+from urllib.parse import urlsplit
+
+
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{32,36})$")
+
+
+def normalize_endpoint(endpoint):
+    path = urlsplit(endpoint).path
+    return "/".join("{id}" if ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram: each bucket is 5% wider than the previous one, so recording
+    is O(1) and percentiles are accurate to within about 5% without keeping samples.
+    """
+
+    GROWTH = 1.05
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.errors = 0
+        self.client_errors = 0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def record(self, elapsed_ms, status):
+        index = int(math.log(max(elapsed_ms, 0.01) / 0.01, self.GROWTH))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if status is None or status >= 500 or status == 429:
+            self.errors += 1
+        elif status >= 400:
+            self.client_errors += 1
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        rank = math.ceil(fraction * self.count)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Upper edge of the bucket, capped by the real maximum.
+                return min(0.01 * self.GROWTH ** (index + 1), self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "p50_ms": round(self.percentile(0.50), 1),
+            "p95_ms": round(self.percentile(0.95), 1),
+            "p99_ms": round(self.percentile(0.99), 1),
+            "max_ms": round(self.max_ms, 1),
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "error_rate": round(self.errors / self.count, 4) if self.count else 0.0,
+            "client_error_rate": round(self.client_errors / self.count, 4) if self.count else 0.0,
+        }
+
+
+class LatencyRecorder:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, method, endpoint, elapsed_ms, status):
+        key = (method, normalize_endpoint(endpoint))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.record(elapsed_ms, status)
+
+    def summary(self):
+        with self._lock:
+            rows = [
+                {"method": method, "endpoint": endpoint, **histogram.summary()}
+                for (method, endpoint), histogram in self._histograms.items()
+            ]
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def format_table(self):
+        lines = [f"{'method':<7} {'endpoint':<32} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'err%':>6}"]
+        for row in self.summary():
+            lines.append(
+                f"{row['method']:<7} {row['endpoint']:<32} {row['count']:>6} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} "
+                f"{row['error_rate'] * 100:>6.1f}"
+            )
+        return "\n".join(lines)
+
+
+_default_recorder = LatencyRecorder()
+
+
+def get_default_recorder():
+    return _default_recorder
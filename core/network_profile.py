@@ -0,0 +1,135 @@
+import fnmatch
+import os
+import re
+import threading
+
+
+# Only URLs matching these reach the Python route handler; every other request stays in the browser.
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "svg", "webp", "ico", "avif", "bmp"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "mp3", "ogg", "wav", "m4a"),
+    "stylesheet": ("css",),
+    "script": ("js", "mjs"),
+}
+
+STUB_CONTENT_TYPES = {
+    "image": "image/gif",
+    "font": "font/woff2",
+    "stylesheet": "text/css",
+    "script": "application/javascript",
+}
+
+PROFILES = {
+    "off": (),
+    "lean": ("image", "font", "media"),
+}
+
+
+def glob_to_regex(pattern):
+    # fnmatch.translate emits Python-only syntax; route() matchers are evaluated as JS regexes too.
+    return "^" + ".*".join(".".join(re.escape(chunk) for chunk in part.split("?")) for part in pattern.split("*")) + "$"
+
+
+def _split(raw):
+    return tuple(item.strip() for item in (raw or "").split(",") if item.strip())
+
+
+class NetworkProfile:
+    """
+    Routing profile applied to every pooled browser context on acquire: requests whose resource
+    type or URL is blocked are aborted (or stubbed with an empty 200) before they hit the network.
+
+    A test can opt back in with @pytest.mark.network_allow("image", "*fonts.googleapis.com*"):
+    resource types in the marker are no longer blocked, and URLs matching its glob patterns pass.
+
+    Any context.route() makes Playwright disable Chromium's HTTP cache for that context, so pooled
+    contexts (which otherwise keep cached scripts and styles between tests) re-download everything
+    the profile lets through. For a cache-friendly app that can cost more than blocking saves;
+    compare UI_NETWORK_PROFILE=off against lean before relying on it. Blocked requests never get a
+    response, so only their count is reported, not bytes.
+    """
+
+    ACTIONS = ("abort", "stub")
+
+    def __init__(self, block_resource_types=(), block_patterns=(), action="abort"):
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown network block action: {action}. Expected one of {self.ACTIONS}")
+        self.block_resource_types = tuple(block_resource_types)
+        self.block_patterns = tuple(block_patterns)
+        self.action = action
+        self._lock = threading.Lock()
+        self._blocked = {}
+        self._allowed = 0
+
+    @classmethod
+    def from_env(cls):
+        name = os.getenv("UI_NETWORK_PROFILE", "lean")
+        if name not in PROFILES:
+            raise ValueError(f"Unknown network profile: {name}. Expected one of {tuple(PROFILES)}")
+        return cls(
+            block_resource_types=PROFILES[name] + _split(os.getenv("UI_NETWORK_BLOCK_TYPES")),
+            block_patterns=_split(os.getenv("UI_NETWORK_BLOCK_PATTERNS")),
+            action=os.getenv("UI_NETWORK_BLOCK_ACTION", "abort"),
+        )
+
+    def _url_matcher(self, resource_types, patterns):
+        parts = []
+        extensions = [ext for kind in resource_types for ext in RESOURCE_TYPE_EXTENSIONS.get(kind, ())]
+        if extensions:
+            parts.append(r"\.(?:%s)(?:[?#]|$)" % "|".join(extensions))
+        parts.extend(glob_to_regex(pattern) for pattern in patterns)
+        if not parts:
+            return None
+        return re.compile("|".join(f"(?:{part})" for part in parts), re.IGNORECASE)
+
+    def apply(self, context, allow=()):
+        """Install the profile's route on context, minus whatever the test's network_allow marker lists."""
+        resource_types = tuple(kind for kind in self.block_resource_types if kind not in allow)
+        allow_patterns = tuple(item for item in allow if item not in RESOURCE_TYPE_EXTENSIONS)
+        matcher = self._url_matcher(resource_types, self.block_patterns)
+        if matcher is None:
+            return
+
+        def handle(route):
+            request = route.request
+            url = request.url
+            if any(fnmatch.fnmatch(url, pattern) for pattern in allow_patterns):
+                self._count_allowed()
+                route.fallback()
+                return
+            kind = request.resource_type
+            matched_type = kind in resource_types
+            if not matched_type and not any(fnmatch.fnmatch(url, pattern) for pattern in self.block_patterns):
+                # Extension matched but the browser classifies it otherwise (e.g. an XHR for a .json.svg).
+                self._count_allowed()
+                route.fallback()
+                return
+            self._count_blocked(kind)
+            if self.action == "stub":
+                route.fulfill(status=200, body=b"", content_type=STUB_CONTENT_TYPES.get(kind, "text/plain"))
+            else:
+                route.abort("blockedbyclient")
+
+        context.route(matcher, handle)
+
+    def _count_blocked(self, kind):
+        with self._lock:
+            self._blocked[kind] = self._blocked.get(kind, 0) + 1
+
+    def _count_allowed(self):
+        with self._lock:
+            self._allowed += 1
+
+    def stats(self):
+        with self._lock:
+            blocked = dict(self._blocked)
+            allowed = self._allowed
+        return {
+            "block_resource_types": list(self.block_resource_types),
+            "block_patterns": list(self.block_patterns),
+            "action": self.action,
+            "blocked_requests": sum(blocked.values()),
+            "blocked_by_type": blocked,
+            "routed_but_allowed": allowed,
+        }
@@ -0,0 +1,62 @@
+from collections import namedtuple
+from types import MappingProxyType
+
+
+SNAPSHOT_SCRIPT = """(selectors) => {
+    const isVisible = (el) => {
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const result = {};
+    for (const [name, selector] of Object.entries(selectors)) {
+        const elements = document.querySelectorAll(selector);
+        const first = elements[0];
+        result[name] = {
+            count: elements.length,
+            visible: Boolean(first) && isVisible(first),
+            text: first ? (first.textContent || '') : '',
+            innerText: first ? (first.innerText || '') : '',
+        };
+    }
+    return result;
+}"""
+
+
+ElementState = namedtuple("ElementState", ["count", "visible", "text", "inner_text"])
+MISSING = ElementState(count=0, visible=False, text="", inner_text="")
+
+
+class PageSnapshot:
+    """Immutable view of several elements' count, visibility and text taken in one evaluate call."""
+
+    __slots__ = ("_states",)
+
+    def __init__(self, raw):
+        states = {
+            name: ElementState(state["count"], state["visible"], state["text"], state["innerText"])
+            for name, state in raw.items()
+        }
+        object.__setattr__(self, "_states", MappingProxyType(states))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PageSnapshot is immutable")
+
+    def __contains__(self, name):
+        return name in self._states
+
+    def __getitem__(self, name):
+        return self._states.get(name, MISSING)
+
+    def is_visible(self, name):
+        return self[name].visible
+
+    def count(self, name):
+        return self[name].count
+
+    def text(self, name):
+        return self[name].text.strip()
+
+    def as_dict(self):
+        return {name: state._asdict() for name, state in self._states.items()}
@@ -0,0 +1,214 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+import pytest
+
+from core.paths import reports_dir
+
+
+WORKER_ENV = "QA_WORKER_ID"
+STATEFUL_SCOPES = ("module", "package", "class")
+
+
+def worker_id():
+    """"gw0", "gw1", ... inside a --ui-workers worker process, "" otherwise."""
+    return os.getenv(WORKER_ENV, "")
+
+
+def worker_env(name, default=None):
+    """Read NAME_GW1 in worker gw1 when it is set (per-worker accounts), else NAME."""
+    current = worker_id()
+    if current:
+        value = os.getenv(f"{name}_{current.upper()}")
+        if value:
+            return value
+    return os.getenv(name, default)
+
+
+def data_token(length=8):
+    """Unique token for generated test data, prefixed with the worker id so workers never collide."""
+    token = uuid.uuid4().hex[:length]
+    return f"{worker_id()}-{token}" if worker_id() else token
+
+
+def add_parallel_options(parser):
+    group = parser.getgroup("parallel", "worker-sharded parallel runs")
+    group.addoption("--ui-workers", type=int, default=int(os.getenv("UI_WORKERS", "0")),
+                    help="Run the collected tests across this many pytest worker processes.")
+
+
+def _stateful_module(item):
+    fixture_defs = getattr(item, "_fixtureinfo", None)
+    if fixture_defs is None:
+        return False
+    return any(
+        definition.scope in STATEFUL_SCOPES
+        for definitions in fixture_defs.name2fixturedefs.values()
+        for definition in definitions
+    )
+
+
+def build_units(items):
+    """
+    Group items into scheduling units that must run in one process, in collection order.
+    A module whose tests use a module/class/package-scoped fixture (e.g. the sanity journey's
+    SanityContext) is one unit; every other test is a unit of its own.
+    """
+    units = []
+    module_units = {}
+    for item in items:
+        module = item.nodeid.split("::", 1)[0]
+        if module in module_units or _stateful_module(item):
+            if module not in module_units:
+                module_units[module] = []
+                units.append(module_units[module])
+            module_units[module].append(item)
+        else:
+            units.append([item])
+    return units
+
+
+def assign_units(units, shard_count, weight=len):
+    """
+    Longest-processing-time-first: heaviest unit goes to the currently lightest shard.
+    Returns shard_count lists of items, each kept in collection order.
+    """
+    order = {id(unit): position for position, unit in enumerate(units)}
+    shards = [{"load": 0.0, "units": []} for _ in range(shard_count)]
+    for unit in sorted(units, key=weight, reverse=True):
+        lightest = min(shards, key=lambda shard: shard["load"])
+        lightest["units"].append(unit)
+        lightest["load"] += weight(unit)
+    return [
+        [item for unit in sorted(shard["units"], key=lambda unit: order[id(unit)]) for item in unit]
+        for shard in shards
+    ]
+
+
+class WorkerReporter:
+    """Inside a worker: stream every test report to a JSON-lines file the controller replays."""
+
+    def __init__(self, config):
+        self.config = config
+        self.path = os.path.join(reports_dir(), "reports.jsonl")
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def pytest_runtest_logreport(self, report):
+        data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+        self._file.write(json.dumps(data) + "\n")
+        self._file.flush()
+
+    def pytest_unconfigure(self):
+        self._file.close()
+
+
+class ParallelController:
+    """
+    Runs the collected tests in N `pytest` subprocesses instead of in-process.
+
+    Each worker gets QA_WORKER_ID=gw<i>, its own browser (session fixtures are per process), its own
+    QA_REPORTS_DIR under qa-reports/workers/ and the controller's Allure results directory. Worker
+    reports are replayed through pytest_runtest_logreport so the terminal summary and exit code
+    look like a normal run; full worker output is kept in qa-reports/workers/<id>/output.log.
+    """
+
+    def __init__(self, config, workers, history=None):
+        self.config = config
+        self.workers = workers
+        self.history = history
+
+    def _worker_args(self):
+        args = list(self.config.invocation_params.args)
+        positional = set(self.config.args)
+        kept = []
+        skip_next = False
+        for arg in args:
+            if skip_next:
+                skip_next = False
+                continue
+            if arg == "--ui-workers":
+                skip_next = True
+                continue
+            if arg.startswith("--ui-workers=") or arg in positional:
+                continue
+            kept.append(arg)
+        return kept
+
+    def _spawn(self, index, items):
+        current = f"gw{index}"
+        directory = reports_dir("workers", current)
+        ids_path = os.path.join(directory, "nodeids.txt")
+        with open(ids_path, "w", encoding="utf-8") as target:
+            target.write("\n".join(item.nodeid for item in items) + "\n")
+        env = dict(os.environ, **{WORKER_ENV: current, "QA_REPORTS_DIR": directory})
+        output = open(os.path.join(directory, "output.log"), "w", encoding="utf-8")
+        process = subprocess.Popen(
+            [sys.executable, "-m", "pytest", *self._worker_args(), f"@{ids_path}"],
+            cwd=str(self.config.invocation_params.dir),
+            env=env,
+            stdout=output,
+            stderr=subprocess.STDOUT,
+        )
+        return current, process, output, directory
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.config.option.collectonly or not session.items:
+            return None
+
+        # Balance by recorded durations when there is a history (core.sharding), else by test count.
+        weight = self.history.weigher(session.items) if self.history else len
+        shards = [shard for shard in assign_units(build_units(session.items), self.workers, weight) if shard]
+        reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+        if reporter:
+            reporter.write_line(f"Running {len(session.items)} tests on {len(shards)} workers")
+
+        started = time.perf_counter()
+        running = [self._spawn(index, shard) for index, shard in enumerate(shards)]
+        step_timing = session.config.pluginmanager.get_plugin("step_timing")
+        for current, process, output, directory in running:
+            process.wait()
+            output.close()
+            failed_reports = self._replay(session, directory)
+            if step_timing is not None:
+                step_timing.merge_report(os.path.join(directory, "step_timings.json"))
+            if reporter:
+                reporter.ensure_newline()
+                reporter.write_line(
+                    f"[{current}] exit code {process.returncode} after {time.perf_counter() - started:.1f}s "
+                    f"(log: {os.path.join(directory, 'output.log')})"
+                )
+            if process.returncode not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED,
+                                          pytest.ExitCode.NO_TESTS_COLLECTED):
+                session.testsfailed += 1
+            elif process.returncode == pytest.ExitCode.TESTS_FAILED and not failed_reports:
+                # The worker failed the run after its tests passed (a session-end gate); keep that verdict.
+                session.testsfailed += 1
+        return True
+
+    def _replay(self, session, directory):
+        """Replay a worker's reports; returns how many of them failed."""
+        path = os.path.join(directory, "reports.jsonl")
+        if not os.path.exists(path):
+            return 0
+        failed = 0
+        with open(path, encoding="utf-8") as source:
+            for line in source:
+                report = session.config.hook.pytest_report_from_serializable(config=session.config, data=json.loads(line))
+                # Session's own logreport hook counts failures, so the exit code follows the workers.
+                session.config.hook.pytest_runtest_logreport(report=report)
+                failed += report.failed
+        return failed
+
+
+def register_parallel(config, history=None):
+    if worker_id():
+        config.pluginmanager.register(WorkerReporter(config), "parallel_worker")
+        return
+    workers = config.getoption("ui_workers")
+    if workers > 1 and not config.option.collectonly:
+        config.pluginmanager.register(ParallelController(config, workers, history), "parallel_controller")
@@ -0,0 +1,22 @@
+import os
+
+
+# pytest's rootdir (pytest.ini lives here); outputs land here whichever directory pytest was started from.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _anchored(env_var, default, parts):
+    # Absolute overrides are used as given; relative ones, like the default, are taken from the repo root.
+    path = os.path.join(REPO_ROOT, os.getenv(env_var, default), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def reports_dir(*parts):
+    """Per-run output files (summaries, profiles). Override with QA_REPORTS_DIR."""
+    return _anchored("QA_REPORTS_DIR", "qa-reports", parts)
+
+
+def cache_dir(*parts):
+    """State kept between runs (histories, cached sessions). Override with QA_CACHE_DIR."""
+    return _anchored("QA_CACHE_DIR", ".qa-cache", parts)
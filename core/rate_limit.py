@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+
+
+def _header_number(headers, name):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    Reservation-style token bucket: callers take a token immediately (tokens may go
+    negative) and sleep outside the lock for the returned delay, so waiters are served
+    in arrival order without holding the lock.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now):
+        self._refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def sync(self, now, rate, capacity, remaining):
+        self._refill(now)
+        self.rate = rate
+        self.capacity = capacity
+        # The server count is authoritative: other clients may share the same quota.
+        self.tokens = min(self.tokens, remaining)
+
+
+class RateLimiter:
+    """
+    Schedules requests to one host from the x-ratelimit-limit / -remaining / -reset
+    headers gorest returns. Until the first response is seen requests are not delayed.
+    One instance per host is shared by every thread and async task in the process.
+    """
+
+    LIMIT_HEADER = "x-ratelimit-limit"
+    REMAINING_HEADER = "x-ratelimit-remaining"
+    RESET_HEADER = "x-ratelimit-reset"
+
+    def __init__(self, enabled=True, max_retries=2):
+        self.enabled = enabled
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._bucket = None
+        self._window = None
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._stats = {
+            "requests": 0,
+            "throttled_requests": 0,
+            "throttled_seconds": 0.0,
+            "responses_429": 0,
+        }
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            enabled=os.getenv("API_RATE_LIMIT", "true").lower() != "false",
+            max_retries=int(os.getenv("API_RATE_LIMIT_RETRIES", "2")),
+        )
+
+    def acquire(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._blocked_until - now)
+            if self._bucket is not None:
+                delay = max(delay, self._bucket.reserve(now))
+            self._stats["requests"] += 1
+            if delay > 0:
+                self._stats["throttled_requests"] += 1
+                # Summed over callers: total time requests spent waiting for a token.
+                self._stats["throttled_seconds"] += delay
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            self._in_flight += 1
+
+    def observe(self, response):
+        """Call once per acquire(), with None when the request raised."""
+        if not self.enabled:
+            return
+        if response is None:
+            with self._lock:
+                self._in_flight = max(0, self._in_flight - 1)
+            return
+        self._observe(response)
+
+    def _observe(self, response):
+        headers = response.headers
+        limit = _header_number(headers, self.LIMIT_HEADER)
+        remaining = _header_number(headers, self.REMAINING_HEADER)
+        reset = _header_number(headers, self.RESET_HEADER)
+        if reset is not None and reset > 1e9:
+            reset = max(0.0, reset - time.time())
+
+        with self._lock:
+            now = time.monotonic()
+            self._in_flight = max(0, self._in_flight - 1)
+            if limit and remaining is not None and reset is not None:
+                # The longest reset seen is the best estimate of the quota window length.
+                self._window = max(self._window or 0.0, reset, 1.0)
+                rate = limit / self._window
+                if self._bucket is None:
+                    self._bucket = TokenBucket(rate, limit)
+                # Requests already sent are not reflected in this response's remaining count yet.
+                self._bucket.sync(now, rate, limit, remaining - self._in_flight)
+                if remaining <= 0:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+
+            if response.status_code == 429:
+                self._stats["responses_429"] += 1
+                retry_after = _header_number(headers, "retry-after")
+                pause = retry_after if retry_after is not None else (reset if reset is not None else 1.0)
+                self._blocked_until = max(self._blocked_until, now + pause)
+
+    def should_retry(self, response, attempt):
+        return self.enabled and response.status_code == 429 and attempt < self.max_retries
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["throttled_seconds"] = round(stats["throttled_seconds"], 3)
+            stats["rate_per_second"] = round(self._bucket.rate, 3) if self._bucket else None
+            return stats
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(host):
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = RateLimiter.from_env()
+        return _limiters[host]
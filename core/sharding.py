@@ -0,0 +1,228 @@
+"""
+Duration-balanced sharding.
+
+Every shard must split the suite from the same duration history, so the history used for the
+split is a committed file (--durations-path, default tests/data/perf/test_durations.json) rather
+than a per-machine cache. Each run writes the durations it measured to
+qa-reports/test_durations.json; to refresh the committed history after a sharded CI run, collect
+those per-shard files and merge them:
+
+    python -m core.sharding merge shard-0/test_durations.json shard-1/test_durations.json ...
+
+A local run can also fold its own durations in with --update-durations. The report header shows
+the history digest; pass --durations-digest (QA_DURATIONS_DIGEST) to make a shard refuse to run
+when its history differs from the one the other shards use.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+
+import pytest
+
+from core.parallel import assign_units, build_units, worker_id
+from core.paths import reports_dir
+
+
+DEFAULT_DURATIONS_PATH = "tests/data/perf/test_durations.json"
+GROUP_MARKERS = ("sanity", "smoke", "regression")
+DEFAULT_SECONDS = 1.0
+SMOOTHING = 0.5
+
+
+def _marker_groups(item):
+    return [mark.name for mark in item.iter_markers() if mark.name in GROUP_MARKERS or mark.name.startswith("feature_")]
+
+
+class DurationHistory:
+    """
+    Per-test wall time (setup + call + teardown) from earlier runs, smoothed across runs and kept
+    in a committed JSON file. Tests without history are estimated from the mean of known tests
+    sharing a marker (sanity, smoke, regression, feature_*), else the overall median.
+    """
+
+    def __init__(self, path=DEFAULT_DURATIONS_PATH):
+        self.path = path
+        self.durations = self._read()
+        self._current = {}
+
+    def digest(self):
+        """Short fingerprint of the history the split is computed from; equal on every shard or the split diverges."""
+        canonical = json.dumps(self.durations, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+    def measured(self):
+        return dict(self._current)
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as source:
+                return json.load(source)
+        except (OSError, ValueError):
+            return {}
+
+    def add(self, nodeid, seconds):
+        self._current[nodeid] = self._current.get(nodeid, 0.0) + seconds
+
+    def save(self):
+        if not self._current:
+            return
+        merged = self._read()
+        for nodeid, seconds in self._current.items():
+            previous = merged.get(nodeid)
+            merged[nodeid] = round(seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous, 3)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as target:
+            json.dump(merged, target, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.durations = merged
+        self._current = {}
+
+    def estimator(self, items):
+        known = [self.durations[item.nodeid] for item in items if item.nodeid in self.durations]
+        fallback = statistics.median(known) if known else DEFAULT_SECONDS
+        by_marker = {}
+        for item in items:
+            if item.nodeid in self.durations:
+                for name in _marker_groups(item):
+                    by_marker.setdefault(name, []).append(self.durations[item.nodeid])
+        marker_means = {name: statistics.mean(values) for name, values in by_marker.items()}
+
+        def estimate(item):
+            if item.nodeid in self.durations:
+                return self.durations[item.nodeid]
+            guesses = [marker_means[name] for name in _marker_groups(item) if name in marker_means]
+            return max(guesses) if guesses else fallback
+
+        return estimate
+
+    def weigher(self, items):
+        """Unit weight (seconds) for assign_units, built from this session's items."""
+        estimate = self.estimator(items)
+        return lambda unit: sum(estimate(item) for item in unit)
+
+
+def add_sharding_options(parser):
+    group = parser.getgroup("sharding", "duration-balanced sharding across machines")
+    group.addoption("--shard-count", type=int, default=int(os.getenv("QA_SHARD_COUNT", "1")),
+                    help="Split the selected tests into this many shards.")
+    group.addoption("--shard-index", type=int, default=int(os.getenv("QA_SHARD_INDEX", "0")),
+                    help="Zero-based shard this run executes.")
+    group.addoption("--durations-path", default=os.getenv("QA_DURATIONS_PATH", DEFAULT_DURATIONS_PATH),
+                    help="Committed test duration history the split is computed from, relative to the rootdir.")
+    group.addoption("--durations-digest", default=os.getenv("QA_DURATIONS_DIGEST", ""),
+                    help="Expected history digest; the run stops if its history differs.")
+    group.addoption("--update-durations", action="store_true",
+                    help="Merge this run's measured durations into --durations-path.")
+
+
+class ShardingPlugin:
+    """
+    Records test durations every run and, with --shard-count K --shard-index i, keeps only shard i
+    of a longest-processing-time-first split of the selected tests. Marker selection (-m) is applied
+    first and modules with module-scoped state stay whole (same units as --ui-workers).
+    Every shard computes the same split as long as it sees the same history file.
+    """
+
+    def __init__(self, config, history):
+        self.config = config
+        self.history = history
+        self.shard_count = config.getoption("shard_count")
+        self.shard_index = config.getoption("shard_index")
+        self.update = config.getoption("update_durations")
+        if not 0 <= self.shard_index < max(self.shard_count, 1):
+            raise pytest.UsageError(f"--shard-index must be between 0 and {self.shard_count - 1}")
+        expected = config.getoption("durations_digest")
+        if self.shard_count > 1 and expected and expected != history.digest():
+            raise pytest.UsageError(
+                f"Duration history {history.path} has digest {history.digest()}, expected {expected}: "
+                "shards would compute different splits. Give every shard the same history file."
+            )
+        self.estimated_seconds = None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if self.shard_count <= 1 or not items:
+            return
+        weight = self.history.weigher(items)
+        shards = assign_units(build_units(items), self.shard_count, weight)
+        selected = shards[self.shard_index]
+        keep = {id(item) for item in selected}
+        deselected = [item for item in items if id(item) not in keep]
+        self.estimated_seconds = [round(sum(weight([item]) for item in shard), 1) for shard in shards]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        if self.estimated_seconds is None:
+            return None
+        lines = [
+            f"shard {self.shard_index + 1}/{self.shard_count}: {len(items)} tests; "
+            f"estimated seconds per shard {self.estimated_seconds}",
+            f"duration history {os.path.relpath(self.history.path, str(config.rootpath))} "
+            f"({len(self.history.durations)} tests, digest {self.history.digest()})",
+        ]
+        if not self.history.durations:
+            lines.append("warning: no duration history; shards are balanced by test count only")
+        return lines
+
+    def pytest_runtest_logreport(self, report):
+        self.history.add(report.nodeid, report.duration)
+
+    def pytest_sessionfinish(self, session):
+        if session.config.option.collectonly or not self.history.measured():
+            return
+        with open(os.path.join(reports_dir(), "test_durations.json"), "w", encoding="utf-8") as target:
+            json.dump(self.history.measured(), target, indent=1, sort_keys=True)
+        if self.update:
+            self.history.save()
+
+
+def register_sharding(config):
+    history = DurationHistory(os.path.join(str(config.rootpath), config.getoption("durations_path")))
+    # Workers' reports are replayed in the controller, which records them; don't count them twice.
+    if not worker_id():
+        config.pluginmanager.register(ShardingPlugin(config, history), "sharding")
+    return history
+
+
+def merge(paths, into=DEFAULT_DURATIONS_PATH):
+    """Fold per-shard qa-reports/test_durations.json files into the committed history."""
+    history = DurationHistory(into)
+    runs = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as source:
+            for nodeid, seconds in json.load(source).items():
+                runs.setdefault(nodeid, []).append(seconds)
+    # A test measured by several reports (reruns) counts once, at its mean.
+    for nodeid, seconds in runs.items():
+        history.add(nodeid, statistics.mean(seconds))
+    history.save()
+    return history
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.sharding", description="Maintain the test duration history.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    merge_command = commands.add_parser("merge", help="Merge per-shard test_durations.json files into the history.")
+    merge_command.add_argument("reports", nargs="+")
+    merge_command.add_argument("--into", default=DEFAULT_DURATIONS_PATH)
+    commands.add_parser("digest", help="Print the digest of the history file.").add_argument(
+        "--path", default=DEFAULT_DURATIONS_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "merge":
+        history = merge(args.reports, args.into)
+        print(f"{args.into}: {len(history.durations)} tests, digest {history.digest()}")
+    else:
+        print(DurationHistory(args.path).digest())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
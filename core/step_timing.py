@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+
+import allure
+import allure_commons
+import pytest
+
+from core.parallel import worker_id
+from core.paths import reports_dir
+
+
+STEP_SEPARATOR = " / "
+# Slowdowns smaller than this are treated as noise even when they exceed the percentage threshold.
+MIN_REGRESSION_MS = 250
+
+
+def add_step_timing_options(parser):
+    group = parser.getgroup("step-timing", "allure.step durations and regression gate")
+    group.addoption("--step-baseline", default="tests/data/perf/step_baseline.json",
+                    help="Baseline step durations, relative to the rootdir.")
+    group.addoption("--update-step-baseline", action="store_true",
+                    help="Overwrite the baseline with this run's passing step durations.")
+    group.addoption("--step-gate", choices=("off", "warn", "fail"), default="warn",
+                    help="What to do when a step regresses against the baseline.")
+    group.addoption("--step-max-slowdown-pct", type=float, default=50.0,
+                    help="Flag a step that got slower than its baseline by more than this percentage.")
+    group.addoption("--step-max-slowdown-ms", type=float, default=5000.0,
+                    help="Flag a step that got slower than its baseline by more than this many ms.")
+
+
+class StepTimingPlugin:
+    """
+    Times every allure.step through allure's own start_step/stop_step hooks and compares
+    the per-test, per-step totals with a stored baseline at session end.
+
+    Steps are keyed "<nodeid>::<outer step> / <inner step>"; a step that runs several
+    times in one test (retry loops) contributes the sum of its runs.
+
+    Under --ui-workers each worker only writes its own step_timings.json; the controller merges
+    them (merge_report) and applies the gate and the baseline update once for the whole run.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.baseline_path = os.path.join(str(config.rootpath), config.getoption("step_baseline"))
+        self.update_baseline = config.getoption("update_step_baseline")
+        self.gate = config.getoption("step_gate")
+        self.max_pct = config.getoption("step_max_slowdown_pct")
+        self.max_ms = config.getoption("step_max_slowdown_ms")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open = {}
+        self._current_test = None
+        self._durations = {}
+        self._failed = set()
+        self.regressions = []
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        stack = self._stack()
+        stack.append(title)
+        self._open[uuid] = (self._current_test, STEP_SEPARATOR.join(stack), time.perf_counter())
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        test, path, started = self._open.pop(uuid, (None, None, None))
+        stack = self._stack()
+        if stack:
+            stack.pop()
+        if path is None:
+            return
+        key = f"{test or '<session>'}::{path}"
+        with self._lock:
+            self._durations[key] = self._durations.get(key, 0.0) + (time.perf_counter() - started) * 1000
+            if exc_type is not None:
+                self._failed.add(key)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self._current_test = item.nodeid
+        yield
+        self._current_test = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        yield
+        if call.when != "teardown":
+            return
+        prefix = f"{item.nodeid}::"
+        steps = {key[len(prefix):]: round(ms, 1) for key, ms in self.results().items() if key.startswith(prefix)}
+        if steps:
+            allure.attach(json.dumps(steps, indent=2), name="Step durations (ms)",
+                          attachment_type=allure.attachment_type.JSON)
+
+    def results(self):
+        with self._lock:
+            return dict(self._durations)
+
+    def merge_report(self, path):
+        """Add the steps of another process's step_timings.json (a --ui-workers worker) to this run."""
+        try:
+            with open(path, encoding="utf-8") as source:
+                steps = json.load(source)["steps"]
+        except (OSError, ValueError, KeyError):
+            return
+        with self._lock:
+            for key, step in steps.items():
+                self._durations[key] = self._durations.get(key, 0.0) + step["duration_ms"]
+                if not step["passed"]:
+                    self._failed.add(key)
+
+    def _load_baseline(self):
+        try:
+            with open(self.baseline_path, encoding="utf-8") as source:
+                return json.load(source)
+        except (OSError, ValueError):
+            return None
+
+    def compare(self, baseline):
+        regressions = []
+        for key, duration in sorted(self.results().items()):
+            if key in self._failed or key not in baseline:
+                continue
+            reference = baseline[key]["duration_ms"]
+            delta = duration - reference
+            pct = delta / reference * 100 if reference else 0.0
+            if delta < MIN_REGRESSION_MS:
+                continue
+            if pct > self.max_pct or delta > self.max_ms:
+                regressions.append({
+                    "step": key,
+                    "baseline_ms": round(reference, 1),
+                    "duration_ms": round(duration, 1),
+                    "delta_ms": round(delta, 1),
+                    "delta_pct": round(pct, 1),
+                })
+        return regressions
+
+    def pytest_sessionfinish(self, session):
+        results = self.results()
+        if not results:
+            return
+        baseline = self._load_baseline()
+        self.regressions = self.compare(baseline) if baseline and self.gate != "off" else []
+
+        report = {
+            "steps": {key: {"duration_ms": round(ms, 1), "passed": key not in self._failed} for key, ms in results.items()},
+            "baseline": os.path.relpath(self.baseline_path, str(self.config.rootpath)) if baseline else None,
+            "regressions": self.regressions,
+        }
+        with open(os.path.join(reports_dir(), "step_timings.json"), "w", encoding="utf-8") as target:
+            json.dump(report, target, indent=2)
+
+        if worker_id():
+            # The controller gates and writes one merged baseline from every worker's report.
+            return
+
+        if self.update_baseline:
+            passing = {key: {"duration_ms": round(ms, 1)} for key, ms in results.items() if key not in self._failed}
+            os.makedirs(os.path.dirname(self.baseline_path), exist_ok=True)
+            with open(self.baseline_path, "w", encoding="utf-8") as target:
+                json.dump(dict(sorted(passing.items())), target, indent=2)
+                target.write("\n")
+
+        if self.regressions and self.gate == "fail" and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.regressions:
+            return
+        terminalreporter.write_sep("-", f"Step duration regressions (gate: {self.gate})")
+        for row in self.regressions:
+            terminalreporter.write_line(
+                f"{row['step']}: {row['baseline_ms']:.0f} -> {row['duration_ms']:.0f} ms "
+                f"(+{row['delta_ms']:.0f} ms, +{row['delta_pct']:.0f}%)"
+            )
+
+
+def register_step_timing(config):
+    plugin = StepTimingPlugin(config)
+    config.pluginmanager.register(plugin, "step_timing")
+    allure_commons.plugin_manager.register(plugin)
+    config.add_cleanup(lambda: allure_commons.plugin_manager.unregister(plugin))
+    return plugin
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from collections import deque
+
+
+class UserLease:
+    def __init__(self, user_id, exclusive=False):
+        self.user_id = user_id
+        self.exclusive = exclusive
+
+
+class UserPool:
+    """
+    Session-wide pool of pre-created API users.
+    Shared leases go back to the pool when the test is done with them; exclusive leases
+    (tests that mutate or delete the user) and users from failed tests are retired instead.
+    Everything that was created is bulk-deleted in drain().
+    """
+
+    def __init__(self, async_client, payload_factory, size=5, endpoint="/users"):
+        self.async_client = async_client
+        self.payload_factory = payload_factory
+        self.size = size
+        self.endpoint = endpoint
+        self._lock = threading.Lock()
+        self._available = deque()
+        self._created = []
+        self._filled = False
+
+    def _create(self, count):
+        payloads = [self.payload_factory() for _ in range(count)]
+        user_ids = asyncio.run(self.async_client.create_users(payloads, endpoint=self.endpoint))
+        self._created.extend(user_ids)
+        return user_ids
+
+    def fill(self):
+        with self._lock:
+            if not self._filled:
+                self._available.extend(self._create(self.size))
+                self._filled = True
+
+    def lease(self, exclusive=False):
+        self.fill()
+        with self._lock:
+            user_id = self._available.popleft() if self._available else self._create(1)[0]
+        return UserLease(user_id, exclusive=exclusive)
+
+    def release(self, lease, dirty=False):
+        if lease.exclusive or dirty:
+            return
+        with self._lock:
+            self._available.append(lease.user_id)
+
+    def drain(self):
+        """Delete every user the pool created; returns {user_id: error} for the deletions that failed."""
+        with self._lock:
+            created, self._created = self._created, []
+            self._available.clear()
+            self._filled = False
+        if not created:
+            return {}
+        results = asyncio.run(self.async_client.delete_users(created, endpoint=self.endpoint))
+        failures = {}
+        for user_id, result in results.items():
+            if isinstance(result, BaseException):
+                failures[user_id] = repr(result)
+            # Exclusive leases may already have deleted their user; a 404 here is expected.
+            elif result.status_code not in (204, 404):
+                failures[user_id] = f"{result.status_code} {result.text}"
+        return failures
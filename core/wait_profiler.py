@@ -0,0 +1,234 @@
+import os
+import sys
+import threading
+import time
+
+from playwright.sync_api import Locator
+
+from core.paths import REPO_ROOT
+
+
+THIS_FILE = os.path.abspath(__file__)
+BASE_PAGE_FILE = os.path.join(REPO_ROOT, "core", "base_page.py")
+# Waiting machinery between a page-object method and Playwright; never the caller worth reporting.
+HELPER_FILES = {THIS_FILE} | {
+    os.path.join(REPO_ROOT, "core", name) for name in ("dom_index.py", "adaptive_timeouts.py", "page_snapshot.py")
+}
+# @measured wraps page-object methods; its frame stands for the decorated method.
+DECORATOR_FILE = os.path.join(REPO_ROOT, "core", "browser_metrics.py")
+NON_REPO_DIRS = {".venv", "venv", "env", ".tox", ".nox", "site-packages", "dist-packages", "node_modules"}
+
+NAVIGATIONS = {"goto", "reload", "go_back", "go_forward", "wait_for_load_state", "wait_for_url"}
+ACTIONS = {"click", "dblclick", "fill", "type", "press", "check", "uncheck", "select_option", "hover", "set_input_files"}
+WAITS = {"wait_for_selector", "wait_for_function", "wait_for", "wait_for_timeout", "wait_for_event"}
+QUERIES = {"evaluate", "count", "is_visible", "is_hidden", "inner_text", "text_content", "get_attribute", "input_value"}
+
+KINDS = {}
+for _kind, _names in (("navigation", NAVIGATIONS), ("action", ACTIONS), ("wait", WAITS), ("query", QUERIES)):
+    KINDS.update(dict.fromkeys(_names, _kind))
+
+
+def _script_target(args, kwargs):
+    # evaluate/wait_for_function take a script; label them by the selector or first token they were given.
+    arg = kwargs.get("arg", args[1] if len(args) > 1 else None)
+    if isinstance(arg, dict):
+        return str(arg.get("selector", ""))
+    if isinstance(arg, (list, tuple)) and arg and isinstance(arg[0], str):
+        return arg[0]
+    return ""
+
+
+class ProfiledLocator:
+    """Locator proxy that times calls and keeps the selector it was built from for the report."""
+
+    def __init__(self, locator, selector, profiler):
+        self._locator = locator
+        self._selector = selector
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        value = getattr(self._locator, name)
+        if isinstance(value, Locator):
+            return ProfiledLocator(value, f"{self._selector} >> {name}", self._profiler)
+        if not callable(value):
+            return value
+        if name in KINDS:
+            return self._profiler.timed(KINDS[name], name, self._selector, value)
+
+        def chained(*args, **kwargs):
+            result = value(*args, **kwargs)
+            if isinstance(result, Locator):
+                suffix = args[0] if args and isinstance(args[0], str) else name
+                return ProfiledLocator(result, f"{self._selector} >> {suffix}", self._profiler)
+            return result
+
+        return chained
+
+
+class ProfiledPage:
+    """Page proxy that times navigations, actions, waits and queries issued by page objects."""
+
+    def __init__(self, page, profiler):
+        self._page = page
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        value = getattr(self._page, name)
+        if name == "locator":
+            return lambda selector, **kwargs: ProfiledLocator(value(selector, **kwargs), selector, self._profiler)
+        if name not in KINDS:
+            return value
+        return self._profiler.timed(KINDS[name], name, None, value)
+
+
+class WaitProfiler:
+    """
+    Aggregates Playwright call durations by the page-object method that issued them.
+
+    Every call is attributed to its innermost public page-object method (e.g. FamilyAppPage.create_task),
+    its call site (file:line) and selector; the full chain of repo frames above it becomes a
+    folded stack so the session can be rendered as a flame graph (flamegraph.pl, speedscope).
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._stacks = {}
+        self._paths = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=os.getenv("UI_WAIT_PROFILE", "true").lower() != "false")
+
+    def wrap_page(self, page):
+        if not self.enabled or isinstance(page, ProfiledPage):
+            return page
+        return ProfiledPage(page, self)
+
+    def timed(self, kind, operation, selector, function):
+        def call(*args, **kwargs):
+            target = selector
+            if target is None:
+                if operation in ("evaluate", "wait_for_function"):
+                    target = _script_target(args, kwargs)
+                else:
+                    target = args[0] if args and isinstance(args[0], str) else ""
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(kind, operation, target, (time.perf_counter() - started) * 1000, sys._getframe(1))
+
+        return call
+
+    def _repo_path(self, code_filename):
+        """Absolute path of a repo source file, or None for library, virtualenv and generated frames."""
+        if code_filename not in self._paths:
+            path = os.path.abspath(code_filename)
+            inside = (
+                not code_filename.startswith("<")
+                and path.startswith(REPO_ROOT + os.sep)
+                and not NON_REPO_DIRS.intersection(os.path.relpath(path, REPO_ROOT).split(os.sep))
+            )
+            self._paths[code_filename] = path if inside else None
+        return self._paths[code_filename]
+
+    def _walk(self, frame):
+        from core.base_page import BasePage
+
+        stack = []
+        owner = None
+        call_site = None
+        while frame is not None:
+            filename = self._repo_path(frame.f_code.co_filename)
+            name = frame.f_code.co_name
+            if filename == DECORATOR_FILE and callable(frame.f_locals.get("method")):
+                name = frame.f_locals["method"].__name__
+            elif filename in HELPER_FILES or filename == DECORATOR_FILE:
+                filename = None
+            if filename is not None:
+                if call_site is None:
+                    call_site = f"{os.path.relpath(filename, REPO_ROOT)}:{frame.f_lineno}"
+                instance = frame.f_locals.get("self")
+                if instance is not None:
+                    label = f"{type(instance).__name__}.{name}"
+                    # BasePage helpers (open/click/fill, adaptive_wait) and private page-object helpers
+                    # such as _wait_indexed are plumbing; credit the public page-object method above them.
+                    if (
+                        owner is None
+                        and filename != BASE_PAGE_FILE
+                        and isinstance(instance, BasePage)
+                        and not name.startswith("_")
+                    ):
+                        owner = label
+                else:
+                    label = name
+                stack.append(label)
+            frame = frame.f_back
+        stack.reverse()
+        return owner or "<outside page objects>", call_site or "?", stack
+
+    def record(self, kind, operation, selector, duration_ms, frame):
+        owner, call_site, stack = self._walk(frame)
+        stack.append(f"{operation} {selector}".strip())
+        key = (owner, kind, operation, selector, call_site)
+        folded = ";".join(label.replace(";", ",") for label in stack)
+        with self._lock:
+            row = self._rows.setdefault(key, [0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += duration_ms
+            row[2] = max(row[2], duration_ms)
+            self._stacks[folded] = self._stacks.get(folded, 0.0) + duration_ms
+
+    def summary(self):
+        with self._lock:
+            rows = [
+                {
+                    "page_method": owner,
+                    "kind": kind,
+                    "operation": operation,
+                    "selector": selector,
+                    "call_site": call_site,
+                    "count": count,
+                    "total_ms": round(total, 1),
+                    "max_ms": round(peak, 1),
+                }
+                for (owner, kind, operation, selector, call_site), (count, total, peak) in self._rows.items()
+            ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def by_page_method(self):
+        totals = {}
+        for row in self.summary():
+            entry = totals.setdefault(row["page_method"], {"page_method": row["page_method"], "count": 0, "total_ms": 0.0})
+            entry["count"] += row["count"]
+            entry["total_ms"] = round(entry["total_ms"] + row["total_ms"], 1)
+        return sorted(totals.values(), key=lambda entry: entry["total_ms"], reverse=True)
+
+    def folded_stacks(self):
+        # One "frame;frame;leaf value" line per stack, value in whole milliseconds.
+        with self._lock:
+            stacks = sorted(self._stacks.items())
+        return "\n".join(f"{stack} {max(1, round(total))}" for stack, total in stacks) + "\n"
+
+    def format_table(self, limit=25):
+        lines = [f"{'total ms':>10} {'count':>6} {'max ms':>9}  {'page method':<40} {'operation':<18} selector @ call site"]
+        for row in self.summary()[:limit]:
+            lines.append(
+                f"{row['total_ms']:>10.1f} {row['count']:>6} {row['max_ms']:>9.1f}  {row['page_method']:<40} "
+                f"{row['operation']:<18} {row['selector'][:60]} @ {row['call_site']}"
+            )
+        return "\n".join(lines)
+
+
+_default_profiler = None
+_default_profiler_lock = threading.Lock()
+
+
+def get_default_profiler():
+    global _default_profiler
+    with _default_profiler_lock:
+        if _default_profiler is None:
+            _default_profiler = WaitProfiler.from_env()
+        return _default_profiler
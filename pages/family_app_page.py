@@ -1,6 +1,8 @@
 from datetime import datetime
 
 from core.base_page import BasePage
+from core.browser_metrics import BrowserMetrics, get_default_metrics_log, measured
+from core.dom_index import DomIndex
 from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 
@@ -67,6 +69,42 @@ class FamilyAppPage(BasePage):
     MESSAGE_TEXT = "#message-text"
     MESSAGES_LIST = "#messages-list"
 
+    SNAPSHOT_SELECTORS = {
+        "tasks_section": TASKS_SECTION,
+        "sidebar": SIDEBAR,
+        "family_panel": FAMILY_PANEL,
+        "family_name": FAMILY_NAME,
+        "create_family_section": CREATE_FAMILY_SECTION,
+        "nav_settings": NAV_SETTINGS,
+        "family_settings_section": FAMILY_SETTINGS_SECTION,
+        "family_members_section": FAMILY_MEMBERS_SECTION,
+        "settings_family_name": SETTINGS_FAMILY_NAME,
+        "add_child_form": ADD_CHILD_FORM,
+        "status": "#status",
+        "auth_error": "#auth-error",
+        "user_email": USER_EMAIL,
+    }
+
+    INDEXED_ELEMENTS = {
+        "tasks": "#tasks-list .task-card",
+        "archive": "#archive-list .task-card",
+        "messages": "#messages-list > *",
+        "calendar_events": ".calendar-event",
+    }
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.dom_index = DomIndex(self.page, self.INDEXED_ELEMENTS)
+        self.browser_metrics = BrowserMetrics.from_env(self.page, get_default_metrics_log())
+
+    def _wait_indexed(self, kind, text, present=True, timeout=30000, site=None):
+        site = site or f"wait_indexed.{kind}.{'appear' if present else 'disappear'}"
+        with self.adaptive_wait(site, timeout) as wait:
+            if not self.dom_index.wait_for(kind, text, present=present, timeout=wait.budget):
+                state = "appear in" if present else "disappear from"
+                raise PlaywrightTimeoutError(f"Timeout {wait.budget}ms waiting for '{text}' to {state} {kind}.")
+
+    @measured("open_home", navigation=True)
     def open_home(self):
         self.open(self.URL)
         self.page.wait_for_selector(self.AUTH_SECTION, state="visible")
@@ -75,8 +113,10 @@ class FamilyAppPage(BasePage):
         self.page.wait_for_selector(self.LOGIN_EMAIL, state="visible")
         self.fill(self.LOGIN_EMAIL, email)
         self.fill(self.LOGIN_PASSWORD, password)
+        self.browser_metrics.mark("login_submitted")
         self.click(self.LOGIN_BUTTON)
 
+    @measured("logged_in_after_submit", since_mark="login_submitted")
     def wait_until_logged_in(self, email):
         self.page.wait_for_selector(self.TASKS_SECTION, state="visible")
         self.page.wait_for_selector(self.SIDEBAR, state="visible")
@@ -88,6 +128,22 @@ class FamilyAppPage(BasePage):
             arg={"selector": self.USER_EMAIL, "expectedEmail": email},
         )
 
+    def is_session_restored(self, email, timeout=5000):
+        self.open(self.URL)
+        try:
+            self.page.wait_for_function(
+                """({ selector, expectedEmail }) => {
+                    const el = document.querySelector(selector);
+                    return Boolean(el) && el.textContent.includes(expectedEmail);
+                }""",
+                arg={"selector": self.USER_EMAIL, "expectedEmail": email},
+                timeout=timeout,
+            )
+            self.page.wait_for_selector(self.TASKS_SECTION, state="visible", timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
     def wait_until_logged_out(self):
         self.page.wait_for_selector(self.AUTH_SECTION, state="visible")
         self.page.wait_for_selector(self.TASKS_SECTION, state="hidden")
@@ -110,39 +166,42 @@ class FamilyAppPage(BasePage):
         self.login(email, password)
         self.wait_until_logged_in(email)
 
+    @measured("open_tasks")
     def open_tasks(self):
         self.page.locator(self.NAV_TASKS).click()
         self.page.wait_for_selector(self.TASKS_SECTION, state="visible")
 
+    @measured("open_calendar")
     def open_calendar(self):
         self.page.locator(self.NAV_CALENDAR).click()
         self.page.wait_for_selector(self.CALENDAR_SECTION, state="visible")
 
+    @measured("open_messages")
     def open_messages(self):
         self.page.locator(self.NAV_MESSAGES).click()
         self.page.wait_for_selector(self.MESSAGES_SECTION, state="visible")
 
+    @measured("open_family_settings")
     def open_family_settings(self):
         self.page.locator(self.NAV_SETTINGS_SELECTOR).click()
         self.page.wait_for_selector(self.FAMILY_SETTINGS_SECTION, state="visible")
 
     def is_tasks_section_visible(self):
-        return self.page.locator(self.TASKS_SECTION).is_visible()
+        return self._is_visible("tasks_section")
 
     def is_sidebar_visible(self):
-        return self.page.locator(self.SIDEBAR).is_visible()
+        return self._is_visible("sidebar")
 
     def is_family_panel_visible(self):
-        return self.page.locator(self.FAMILY_PANEL).is_visible()
+        return self._is_visible("family_panel")
 
     def get_family_name_text(self):
-        text = self.page.locator(self.FAMILY_NAME).text_content()
-        return (text or "").strip()
+        return self._text("family_name")
 
     def is_create_family_visible(self):
-        section = self.page.locator(self.CREATE_FAMILY_SECTION)
-        return section.count() > 0 and section.first.is_visible()
+        return self._is_visible("create_family_section")
 
+    @measured("create_family")
     def create_family(self, family_name):
         self.page.wait_for_selector(self.CREATE_FAMILY_FORM, state="visible")
         self.fill(self.CREATE_FAMILY_NAME_INPUT, family_name)
@@ -150,40 +209,35 @@ class FamilyAppPage(BasePage):
         self.page.wait_for_selector(self.FAMILY_PANEL, state="visible")
 
     def is_family_settings_nav_visible(self):
-        nav = self.page.locator(self.NAV_SETTINGS)
-        return nav.count() > 0 and nav.first.is_visible()
+        return self._is_visible("nav_settings")
 
     def is_family_settings_section_visible(self):
-        section = self.page.locator(self.FAMILY_SETTINGS_SECTION)
-        return section.count() > 0 and section.first.is_visible()
+        return self._is_visible("family_settings_section")
 
     def is_family_members_section_visible(self):
-        section = self.page.locator(self.FAMILY_MEMBERS_SECTION)
-        return section.count() > 0 and section.first.is_visible()
+        return self._is_visible("family_members_section")
 
     def get_settings_family_name_text(self):
-        name = self.page.locator(self.SETTINGS_FAMILY_NAME)
-        if name.count() == 0:
-            return ""
-        text = name.first.text_content()
-        return (text or "").strip()
+        return self._text("settings_family_name")
 
     def wait_for_settings_family_name(self, timeout=15000):
         try:
-            self.page.wait_for_function(
-                """({ selector }) => {
-                    const el = document.querySelector(selector);
-                    if (!el) return false;
-                    const text = (el.textContent || '').trim();
-                    return text !== '' && text !== '—';
-                }""",
-                arg={"selector": self.SETTINGS_FAMILY_NAME},
-                timeout=timeout,
-            )
+            with self.adaptive_wait("wait_for_settings_family_name", timeout) as wait:
+                self.page.wait_for_function(
+                    """({ selector }) => {
+                        const el = document.querySelector(selector);
+                        if (!el) return false;
+                        const text = (el.textContent || '').trim();
+                        return text !== '' && text !== '—';
+                    }""",
+                    arg={"selector": self.SETTINGS_FAMILY_NAME},
+                    timeout=wait.budget,
+                )
         except PlaywrightTimeoutError:
             return ""
         return self.get_settings_family_name_text()
 
+    @measured("add_child_user")
     def add_child_user(self, child_email, child_password, parent_password, child_name=""):
         self.page.wait_for_selector(self.ADD_CHILD_FORM, state="visible")
         self.fill(self.CHILD_EMAIL, child_email)
@@ -199,30 +253,32 @@ class FamilyAppPage(BasePage):
             expected_markers.insert(0, cleaned_name)
 
         try:
-            self.page.wait_for_function(
-                """({ selector, expected }) => {
-                    const element = document.querySelector(selector);
-                    if (!element) return false;
-                    return expected.some((token) => token && element.textContent.includes(token));
-                }""",
-                arg={"selector": self.FAMILY_MEMBERS_LIST, "expected": expected_markers},
-                timeout=25000,
-            )
+            with self.adaptive_wait("add_child_user.member_listed", 25000) as wait:
+                self.page.wait_for_function(
+                    """({ selector, expected }) => {
+                        const element = document.querySelector(selector);
+                        if (!element) return false;
+                        return expected.some((token) => token && element.textContent.includes(token));
+                    }""",
+                    arg={"selector": self.FAMILY_MEMBERS_LIST, "expected": expected_markers},
+                    timeout=wait.budget,
+                )
             return
         except PlaywrightTimeoutError:
             self.open_family_settings()
             self.page.wait_for_selector(self.FAMILY_MEMBERS_LIST, state="visible")
 
         try:
-            self.page.wait_for_function(
-                """({ selector, expected }) => {
-                    const element = document.querySelector(selector);
-                    if (!element) return false;
-                    return expected.some((token) => token && element.textContent.includes(token));
-                }""",
-                arg={"selector": self.FAMILY_MEMBERS_LIST, "expected": expected_markers},
-                timeout=20000,
-            )
+            with self.adaptive_wait("add_child_user.member_listed_after_reopen", 20000) as wait:
+                self.page.wait_for_function(
+                    """({ selector, expected }) => {
+                        const element = document.querySelector(selector);
+                        if (!element) return false;
+                        return expected.some((token) => token && element.textContent.includes(token));
+                    }""",
+                    arg={"selector": self.FAMILY_MEMBERS_LIST, "expected": expected_markers},
+                    timeout=wait.budget,
+                )
         except PlaywrightTimeoutError:
             auth_error = (self.page.locator("#auth-error").text_content() or "").strip()
             status_text = (self.page.locator("#status").text_content() or "").strip()
@@ -232,6 +288,7 @@ class FamilyAppPage(BasePage):
     def is_family_member_listed(self, member_text):
         return self.page.locator(self.FAMILY_MEMBERS_LIST).inner_text().find(member_text) != -1
 
+    @measured("create_task")
     def create_task(self, title, assigned_member_text=None, details=""):
         self.open_tasks()
         self.page.wait_for_selector(self.NEW_TASK_BUTTON, state="visible")
@@ -252,13 +309,7 @@ class FamilyAppPage(BasePage):
 
         self.page.locator(self.TASK_SAVE_BUTTON).click()
         self.page.wait_for_selector(self.TASKS_LIST, state="visible")
-        self.page.wait_for_function(
-            """({ selector, taskTitle }) => {
-                const cards = Array.from(document.querySelectorAll(selector));
-                return cards.some((card) => card.textContent.includes(taskTitle));
-            }""",
-            arg={"selector": "#tasks-list .task-card", "taskTitle": title},
-        )
+        self._wait_indexed("tasks", title)
 
     def _task_card_locator(self, title, in_archive=False):
         list_selector = self.ARCHIVE_LIST if in_archive else self.TASKS_LIST
@@ -277,7 +328,8 @@ class FamilyAppPage(BasePage):
         )
 
         try:
-            task_locator.first.wait_for(state="visible", timeout=timeout)
+            with self.adaptive_wait("wait_for_open_task", timeout) as wait:
+                task_locator.first.wait_for(state="visible", timeout=wait.budget)
             return True
         except Exception:
             return False
@@ -286,14 +338,7 @@ class FamilyAppPage(BasePage):
         self.open_tasks()
         first_wait = max(5000, timeout // 2)
         try:
-            self.page.wait_for_function(
-                """({ title }) => {
-                    const cards = Array.from(document.querySelectorAll('#tasks-list .task-card'));
-                    return !cards.some((card) => card.textContent.includes(title));
-                }""",
-                arg={"title": title},
-                timeout=first_wait,
-            )
+            self._wait_indexed("tasks", title, present=False, timeout=first_wait, site="wait_for_task_not_open.first_attempt")
             return True
         except PlaywrightTimeoutError:
             self.page.reload(wait_until="domcontentloaded")
@@ -303,23 +348,21 @@ class FamilyAppPage(BasePage):
             self.open_tasks()
 
         try:
-            self.page.wait_for_function(
-                """({ title }) => {
-                    const cards = Array.from(document.querySelectorAll('#tasks-list .task-card'));
-                    return !cards.some((card) => card.textContent.includes(title));
-                }""",
-                arg={"title": title},
-                timeout=max(5000, timeout - first_wait),
+            self._wait_indexed(
+                "tasks", title, present=False, timeout=max(5000, timeout - first_wait), site="wait_for_task_not_open.after_reload"
             )
             return True
         except PlaywrightTimeoutError:
             return False
 
     def get_ui_diagnostics(self):
-        status_text = (self.page.locator("#status").text_content() or "").strip()
-        auth_error = (self.page.locator("#auth-error").text_content() or "").strip()
-        user_email = (self.page.locator(self.USER_EMAIL).text_content() or "").strip()
-        return f"status='{status_text}' auth_error='{auth_error}' user='{user_email}'"
+        snapshot = self._active_snapshot or self.snapshot(
+            {name: self.SNAPSHOT_SELECTORS[name] for name in ("status", "auth_error", "user_email")}
+        )
+        return (
+            f"status='{snapshot.text('status')}' auth_error='{snapshot.text('auth_error')}' "
+            f"user='{snapshot.text('user_email')}'"
+        )
 
     def is_archive_task_visible(self, title):
         card = self._task_card_locator(title, in_archive=True)
@@ -331,6 +374,7 @@ class FamilyAppPage(BasePage):
             raise AssertionError(f"Task card not found for title: {title}")
         return card.inner_text()
 
+    @measured("complete_open_task")
     def complete_open_task(self, title):
         card = self._task_card_locator(title, in_archive=False)
         if card.count() == 0:
@@ -356,14 +400,7 @@ class FamilyAppPage(BasePage):
         self.open_archive()
         first_wait = max(5000, timeout // 2)
         try:
-            self.page.wait_for_function(
-                """({ title }) => {
-                    const cards = Array.from(document.querySelectorAll('#archive-list .task-card'));
-                    return cards.some((card) => card.textContent.includes(title));
-                }""",
-                arg={"title": title},
-                timeout=first_wait,
-            )
+            self._wait_indexed("archive", title, timeout=first_wait, site="wait_for_archive_task.first_attempt")
             return True
         except PlaywrightTimeoutError:
             self.page.reload(wait_until="domcontentloaded")
@@ -373,18 +410,14 @@ class FamilyAppPage(BasePage):
             self.open_archive()
 
         try:
-            self.page.wait_for_function(
-                """({ title }) => {
-                    const cards = Array.from(document.querySelectorAll('#archive-list .task-card'));
-                    return cards.some((card) => card.textContent.includes(title));
-                }""",
-                arg={"title": title},
-                timeout=max(5000, timeout - first_wait),
+            self._wait_indexed(
+                "archive", title, timeout=max(5000, timeout - first_wait), site="wait_for_archive_task.after_reload"
             )
             return True
         except PlaywrightTimeoutError:
             return False
 
+    @measured("create_calendar_event")
     def create_calendar_event(self, title):
         self.open_calendar()
 
@@ -396,13 +429,14 @@ class FamilyAppPage(BasePage):
                 if first_value:
                     calendar_user_select.select_option(value=first_value)
 
-        self.page.wait_for_function(
-            """() => {
-                const days = document.querySelectorAll('#calendar-days-container .calendar-day:not(.other-month)');
-                return days.length > 0;
-            }""",
-            timeout=20000,
-        )
+        with self.adaptive_wait("create_calendar_event.days_rendered", 20000) as wait:
+            self.page.wait_for_function(
+                """() => {
+                    const days = document.querySelectorAll('#calendar-days-container .calendar-day:not(.other-month)');
+                    return days.length > 0;
+                }""",
+                timeout=wait.budget,
+            )
 
         day_locator = self.page.locator("#calendar-days-container .calendar-day:not(.other-month)").first
         if day_locator.count() == 0:
@@ -418,29 +452,18 @@ class FamilyAppPage(BasePage):
 
         self.page.locator(f"{self.EVENT_FORM} button[type='submit']").click()
         self.page.wait_for_selector(self.EVENT_MODAL, state="hidden")
-        self.page.wait_for_function(
-            """(title) => {
-                const events = Array.from(document.querySelectorAll('.calendar-event'));
-                return events.some((eventEl) => eventEl.textContent.includes(title));
-            }""",
-            arg=title,
-        )
+        self._wait_indexed("calendar_events", title)
 
     def is_calendar_event_visible(self, title):
         return self.page.locator(".calendar-event", has_text=title).count() > 0
 
+    @measured("post_message")
     def post_message(self, text):
         self.open_messages()
         self.page.wait_for_selector(self.MESSAGE_FORM, state="visible")
         self.fill(self.MESSAGE_TEXT, text)
         self.page.locator(f"{self.MESSAGE_FORM} button[type='submit']").click()
-        self.page.wait_for_function(
-            """({ selector, text }) => {
-                const container = document.querySelector(selector);
-                return Boolean(container) && container.textContent.includes(text);
-            }""",
-            arg={"selector": self.MESSAGES_LIST, "text": text},
-        )
+        self._wait_indexed("messages", text)
 
     def message_exists(self, text):
         return self.page.locator(self.MESSAGES_LIST).inner_text().find(text) != -1
@@ -450,5 +473,4 @@ class FamilyAppPage(BasePage):
         self.page.wait_for_load_state("domcontentloaded")
 
     def is_add_child_form_visible(self):
-        form = self.page.locator(self.ADD_CHILD_FORM)
-        return form.count() > 0 and form.first.is_visible()
+        return self._is_visible("add_child_form")
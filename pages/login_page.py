@@ -1,4 +1,5 @@
 from core.base_page import BasePage
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 
 class LoginPage(BasePage):
@@ -17,6 +18,13 @@ class LoginPage(BasePage):
     LOGIN_PASSWORD = "#login-form input[name='password']"
     LOGIN_BUTTON = "#login-form button[type='submit']"
 
+    SNAPSHOT_SELECTORS = {
+        "auth_section": AUTH_SECTION,
+        "tasks_section": TASKS_SECTION,
+        "user_email": USER_EMAIL,
+        "auth_error": AUTH_ERROR,
+    }
+
     def open_home(self):
         self.open(self.URL)
 
@@ -25,27 +33,35 @@ class LoginPage(BasePage):
         self.fill(self.LOGIN_PASSWORD, password)
         self.click(self.LOGIN_BUTTON)
 
-    def wait_until_logged_in(self, email):
-        self.page.wait_for_selector(self.TASKS_SECTION, state="visible")
+    def wait_until_logged_in(self, email, timeout=None):
+        self.page.wait_for_selector(self.TASKS_SECTION, state="visible", timeout=timeout)
         self.page.wait_for_function(
             """({ selector, expectedEmail }) => {
                 const element = document.querySelector(selector);
                 return Boolean(element) && element.textContent.includes(expectedEmail);
             }""",
             arg={"selector": self.USER_EMAIL, "expectedEmail": email},
+            timeout=timeout,
         )
 
+    def is_session_restored(self, email, timeout=5000):
+        try:
+            self.wait_until_logged_in(email, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
     def is_auth_section_hidden(self):
-        return self.page.locator(self.AUTH_SECTION).is_hidden()
+        return not self._is_visible("auth_section")
 
     def is_tasks_section_visible(self):
-        return self.page.locator(self.TASKS_SECTION).is_visible()
+        return self._is_visible("tasks_section")
 
     def get_user_email_text(self):
-        return self.get_text(self.USER_EMAIL)
+        return self._text("user_email", inner_text=True)
 
     def is_auth_error_hidden(self):
-        return self.page.locator(self.AUTH_ERROR).is_hidden()
+        return not self._is_visible("auth_error")
 
     def logout(self):
         sidebar_logout = self.page.locator(self.SIDEBAR_LOGOUT)
@@ -1,29 +1,188 @@
+import asyncio
+import json
+import os
+import warnings
 import pytest
+import allure
 from playwright.sync_api import sync_playwright
+from core.api_attachments import close_default_pipeline, get_default_pipeline
 from core.api_client import APIClient
+from core.async_api_client import AsyncAPIClient
+from core.cassette import Cassette, CassetteServer
+from core.http_pool import close_default_pool, get_default_pool
+from core.latency import get_default_recorder
+from core.paths import reports_dir
+from core.rate_limit import get_rate_limiter
+from core.user_pool import UserPool
 import uuid
+from urllib.parse import urlsplit
 
-@pytest.fixture
-def api_client():
-    return APIClient("https://gorest.co.in/public/v2")
+GOREST_BASE_URL = "https://gorest.co.in/public/v2"
+DEFAULT_CASSETTE_PATH = "tests/data/cassettes/gorest_users.jsonl.gz"
 
-@pytest.fixture
-def created_user(api_client):
-    unique_email = f"dina_{uuid.uuid4()}@example.com"
 
-    payload = {
+def build_user_payload():
+    return {
         "name": "Dina QA",
         "gender": "female",
-        "email": unique_email,
+        "email": f"dina_{uuid.uuid4()}@example.com",
         "status": "active"
     }
 
-    response = api_client.post("/users", payload)
-    assert response.status_code == 201
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "setup" and report.passed:
+        return
+
+    # Flushing from the report hook keeps attachments on the test itself rather than on a fixture teardown.
+    earlier = (getattr(item, "rep_setup", None), getattr(item, "rep_call", None))
+    failed = report.failed or any(rep is not None and rep.failed for rep in earlier)
+    get_default_pipeline().flush(failed=failed)
+
+def pytest_terminal_summary(terminalreporter):
+    recorder = get_default_recorder()
+    if recorder.summary():
+        terminalreporter.write_sep("-", "API latency per endpoint (ms)")
+        terminalreporter.write_line(recorder.format_table())
+
+@pytest.fixture(scope="session")
+def http_pool():
+    pool = get_default_pool()
+    yield pool
+
+    allure.attach(
+        json.dumps(pool.stats(), indent=2),
+        name="HTTP pool stats",
+        attachment_type=allure.attachment_type.JSON
+    )
+    close_default_pool()
+
+@pytest.fixture(scope="session")
+def attachment_pipeline():
+    pipeline = get_default_pipeline()
+    yield pipeline
+    pipeline.flush()
+    close_default_pipeline()
+
+@pytest.fixture(scope="session")
+def api_cassette(request):
+    mode = os.getenv("API_CASSETTE_MODE", "off")
+    path = os.path.join(request.config.rootpath, os.getenv("API_CASSETTE_PATH", DEFAULT_CASSETTE_PATH))
+
+    if mode == "off":
+        yield None
+    elif mode == "record":
+        cassette = Cassette(path)
+        yield cassette
+        cassette.save()
+    elif mode == "replay":
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No API cassette at {path}. Record one first with API_CASSETTE_MODE=record.")
+        yield Cassette.load(path)
+    else:
+        raise ValueError(f"Unknown API_CASSETTE_MODE: {mode}. Expected off, record or replay.")
+
+@pytest.fixture(scope="session")
+def api_base_url(api_cassette):
+    if os.getenv("API_CASSETTE_MODE", "off") != "replay":
+        yield GOREST_BASE_URL
+        return
+
+    server = CassetteServer(api_cassette).start()
+    yield server.url + urlsplit(GOREST_BASE_URL).path
+    server.stop()
+
+@pytest.fixture(scope="session")
+def rate_limiter(api_base_url):
+    limiter = get_rate_limiter(urlsplit(api_base_url).netloc)
+    yield limiter
+
+    allure.attach(
+        json.dumps(limiter.stats(), indent=2),
+        name="Rate limit stats",
+        attachment_type=allure.attachment_type.JSON
+    )
+
+@pytest.fixture(scope="session")
+def latency_recorder():
+    recorder = get_default_recorder()
+    yield recorder
+
+    summary = json.dumps(recorder.summary(), indent=2)
+    with open(os.path.join(reports_dir(), "api_latency.json"), "w", encoding="utf-8") as report:
+        report.write(summary)
+    allure.attach(summary, name="API latency summary", attachment_type=allure.attachment_type.JSON)
+
+@pytest.fixture(scope="session")
+def api_client_options(http_pool, attachment_pipeline, rate_limiter, api_cassette, latency_recorder):
+    recording = os.getenv("API_CASSETTE_MODE", "off") == "record"
+    return {
+        "session_pool": http_pool,
+        "attachments": attachment_pipeline,
+        "rate_limiter": rate_limiter,
+        "cassette": api_cassette if recording else None,
+        "latency": latency_recorder,
+    }
+
+@pytest.fixture
+def api_client(api_base_url, api_client_options):
+    return APIClient(api_base_url, **api_client_options)
 
-    user_id = response.json()["id"]
+@pytest.fixture
+def async_api_client(api_base_url, api_client_options):
+    client = AsyncAPIClient(api_base_url, **api_client_options)
+    yield client
+    client.close()
+
+@pytest.fixture
+def bulk_users(async_api_client):
+    created_ids = []
+
+    def _create(count):
+        payloads = [build_user_payload() for _ in range(count)]
+        user_ids = asyncio.run(async_api_client.create_users(payloads))
+        created_ids.extend(user_ids)
+        return user_ids
+
+    yield _create
+
+    # Teardown
+    if created_ids:
+        asyncio.run(async_api_client.delete_users(created_ids))
 
-    yield user_id
+@pytest.fixture(scope="session")
+def user_pool(api_base_url, api_client_options):
+    client = AsyncAPIClient(api_base_url, **api_client_options)
+    pool = UserPool(client, build_user_payload, size=int(os.getenv("API_USER_POOL_SIZE", "5")))
+    yield pool
 
     # Teardown
-    api_client.delete(f"/users/{user_id}")
\ No newline at end of file
+    leaked = pool.drain()
+    client.close()
+    if leaked:
+        allure.attach(
+            json.dumps(leaked, indent=2),
+            name="User pool cleanup failures",
+            attachment_type=allure.attachment_type.JSON
+        )
+        warnings.warn(f"User pool could not delete {len(leaked)} users: {leaked}")
+
+@pytest.fixture
+def created_user(request, user_pool):
+    lease = user_pool.lease()
+
+    yield lease.user_id
+
+    # A failed test may have left the user in an unknown state, so it is retired instead of returned.
+    failed = getattr(request.node, "rep_call", None) is not None and request.node.rep_call.failed
+    user_pool.release(lease, dirty=failed)
+
+@pytest.fixture
+def exclusive_user(user_pool):
+    lease = user_pool.lease(exclusive=True)
+
+    yield lease.user_id
+
+    user_pool.release(lease)
@@ -1,3 +1,5 @@
+from itertools import islice
+
 from core.api_client import APIClient
 import allure
 
@@ -7,6 +9,13 @@ def test_get_users(api_client):
     response = api_client.get("/users")
     assert response.status_code == 200
 
+@allure.feature("Users API")
+@allure.story("Get users list across pages")
+def test_iter_users_across_pages(api_client):
+    users = list(islice(api_client.iter_records("/users", per_page=10), 25))
+    assert len(users) == 25
+    assert len({user["id"] for user in users}) == 25
+
 @allure.feature("Users API")
 @allure.story("Create user")
 def test_create_user(api_client, created_user):
@@ -16,9 +25,19 @@ def test_create_user(api_client, created_user):
 
 @allure.feature("Users API")
 @allure.story("Delete user")
-def test_delete_user(api_client, created_user):
-    response = api_client.delete(f"/users/{created_user}")
+def test_delete_user(api_client, exclusive_user):
+    response = api_client.delete(f"/users/{exclusive_user}")
     assert response.status_code == 204
 
-    verify = api_client.get(f"/users/{created_user}")
+    verify = api_client.get(f"/users/{exclusive_user}")
     assert verify.status_code == 404
+
+
+@allure.feature("Users API")
+@allure.story("Bulk create users")
+def test_bulk_created_users_are_retrievable(api_client, bulk_users):
+    user_ids = bulk_users(5)
+    assert len(set(user_ids)) == 5
+
+    for user_id in user_ids:
+        assert api_client.get(f"/users/{user_id}").status_code == 200
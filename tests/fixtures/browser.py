@@ -0,0 +1,162 @@
+import json
+import os
+import re
+
+import allure
+import pytest
+from playwright.sync_api import sync_playwright
+
+from core.adaptive_timeouts import get_adaptive_timeouts
+from core.browser_metrics import get_default_metrics_log
+from core.browser_server import connect_or_launch
+from core.console_buffer import ConsoleBuffer
+from core.context_pool import ContextPool
+from core.har_archive import HarArchive
+from core.paths import reports_dir
+from core.wait_profiler import get_default_profiler
+
+
+@pytest.fixture(scope="session")
+def browser():
+    # GitHub Actions automatically sets CI=true
+    is_ci = os.getenv("CI") == "true"
+
+    with sync_playwright() as p:
+        # UI_BROWSER_SERVER=on|auto reuses a long-lived browser server (python -m core.browser_server start).
+        browser, _ = connect_or_launch(p, headless=is_ci, slow_mo=0 if is_ci else 200)
+        yield browser
+        browser.close()
+
+
+def _network_allow(request):
+    marker = request.node.get_closest_marker("network_allow")
+    return marker.args if marker else ()
+
+
+def acquire_context(request, context_pool, har_archive, storage_state=None):
+    context = context_pool.acquire(storage_state=storage_state, network_allow=_network_allow(request))
+    if har_archive is not None:
+        har_archive.attach(context)
+    return context
+
+
+def open_page(context, browser_console):
+    page = context.new_page()
+    browser_console.append(ConsoleBuffer.from_env(f"page {len(browser_console) + 1}").watch(page))
+    return page
+
+
+@pytest.fixture
+def browser_console():
+    """Console/pageerror ring buffers of the test's pages; flushed by pytest_runtest_makereport on failure."""
+    return []
+
+
+@pytest.fixture(scope="session")
+def adaptive_timeouts():
+    timeouts = get_adaptive_timeouts()
+    yield timeouts
+
+    timeouts.save()
+    allure.attach(
+        json.dumps(timeouts.summary(), indent=2),
+        name="Adaptive wait timeouts",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+
+@pytest.fixture(scope="session")
+def wait_profiler():
+    profiler = get_default_profiler()
+    yield profiler
+
+    if not profiler.summary():
+        return
+    report = json.dumps(
+        {"by_page_method": profiler.by_page_method(), "by_call_site": profiler.summary()}, indent=2
+    )
+    with open(os.path.join(reports_dir(), "ui_wait_profile.json"), "w", encoding="utf-8") as target:
+        target.write(report)
+    with open(os.path.join(reports_dir(), "ui_wait_profile.folded"), "w", encoding="utf-8") as target:
+        target.write(profiler.folded_stacks())
+    allure.attach(report, name="UI wait profile", attachment_type=allure.attachment_type.JSON)
+    allure.attach(profiler.format_table(), name="UI wait profile (top call sites)", attachment_type=allure.attachment_type.TEXT)
+
+
+@pytest.fixture(scope="session")
+def browser_metrics_log():
+    log = get_default_metrics_log()
+    yield log
+
+    if not log.samples():
+        return
+    with open(os.path.join(reports_dir(), "browser_metrics.json"), "w", encoding="utf-8") as target:
+        json.dump({"summary": log.summary(), "samples": log.samples()}, target, indent=2)
+    allure.attach(
+        json.dumps(log.summary(), indent=2),
+        name="Browser metrics summary",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser, adaptive_timeouts, wait_profiler, browser_metrics_log):
+    pool = ContextPool.from_env(browser).warm_up()
+    yield pool
+
+    allure.attach(
+        json.dumps(pool.metrics(), indent=2),
+        name="Browser context pool metrics",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    allure.attach(
+        json.dumps(pool.network_profile.stats(), indent=2),
+        name="Network filter stats",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    pool.close()
+
+
+@pytest.fixture
+def har_archive(request):
+    """Per-test backend traffic archive: UI_HAR_MODE=record captures it, replay serves it offline."""
+    if os.getenv("UI_HAR_MODE", "off") == "off":
+        yield None
+        return
+
+    module = os.path.splitext(os.path.relpath(str(request.node.path), str(request.config.rootpath)))[0]
+    name = re.sub(r"[^\w.\-\[\]]", "_", request.node.name)
+    path = os.path.join(str(request.config.rootpath), os.getenv("UI_HAR_DIR", "tests/data/har"), module, f"{name}.har")
+    archive = HarArchive.from_env(path)
+    if archive.mode == "replay":
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"UI_HAR_MODE=replay but no archive was recorded for this test: {path}")
+        archive.load()
+    yield archive
+
+    archive.save()
+    allure.attach(json.dumps(archive.stats(), indent=2), name="HAR archive", attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.fixture
+def page(request, context_pool, har_archive, browser_console):
+    context = acquire_context(request, context_pool, har_archive)
+    page = open_page(context, browser_console)
+    yield page
+    context_pool.release(context)
+
+
+@pytest.fixture
+def page_factory(request, context_pool, har_archive, browser_console):
+    """Open extra pages, each in its own pooled context, for tests that drive several users at once."""
+    contexts = []
+
+    def _open(storage_state=None):
+        context = acquire_context(request, context_pool, har_archive, storage_state=storage_state)
+        contexts.append(context)
+        return open_page(context, browser_console)
+
+    yield _open
+
+    for context in contexts:
+        context_pool.release(context)
@@ -0,0 +1,122 @@
+import os
+
+import allure
+import pytest
+
+from core.auth_state import AuthStateCache
+from core.credential_pool import CredentialPool
+from core.parallel import data_token, worker_env
+from pages.login_page import LoginPage
+from tests.fixtures.browser import acquire_context, open_page
+
+
+@pytest.fixture(scope="session")
+def user_credentials_map():
+    return {
+        "default": {
+            "email": worker_env("UI_USER_DEFAULT_EMAIL", worker_env("UI_TEST_EMAIL", "ngjipiqmftuoxbkecx@nespj.com")),
+            "password": worker_env("UI_USER_DEFAULT_PASSWORD", worker_env("UI_TEST_PASSWORD", "123456")),
+            "role": worker_env("UI_USER_DEFAULT_ROLE", "parent"),
+        },
+        "child_1": {
+            "email": worker_env("UI_USER_CHILD1_EMAIL", ""),
+            "password": worker_env("UI_USER_CHILD1_PASSWORD", ""),
+            "role": worker_env("UI_USER_CHILD1_ROLE", "child"),
+        },
+        "child_2": {
+            "email": worker_env("UI_USER_CHILD2_EMAIL", ""),
+            "password": worker_env("UI_USER_CHILD2_PASSWORD", ""),
+            "role": worker_env("UI_USER_CHILD2_ROLE", "child"),
+        },
+    }
+
+
+@pytest.fixture(scope="session")
+def credential_pool(user_credentials_map):
+    default = user_credentials_map["default"]
+    return CredentialPool.from_env({"email": default["email"], "password": default["password"]})
+
+
+@pytest.fixture
+def leased_parent(credential_pool):
+    """A parent account (and its family) held exclusively by this test across all running processes."""
+    lease = credential_pool.acquire()
+    allure.attach(lease.email, name="Leased parent account", attachment_type=allure.attachment_type.TEXT)
+    yield lease
+    credential_pool.release(lease)
+
+
+@pytest.fixture
+def ui_user(request, user_credentials_map):
+    user_key = getattr(request, "param", "default")
+    if user_key not in user_credentials_map:
+        raise ValueError(f"Unknown ui user profile: {user_key}")
+    return {**user_credentials_map[user_key], "profile": user_key}
+
+
+@pytest.fixture(scope="session")
+def ui_auth_credentials(user_credentials_map):
+    return {
+        "email": user_credentials_map["default"]["email"],
+        "password": user_credentials_map["default"]["password"],
+    }
+
+
+@pytest.fixture(scope="session")
+def auth_state_cache():
+    return AuthStateCache.from_env()
+
+
+@pytest.fixture
+def authenticated_user(request, context_pool, har_archive, browser_console, ui_user, auth_state_cache):
+    if not ui_user["email"] or not ui_user["password"]:
+        raise ValueError("UI user credentials are missing. Set environment variables for the selected user profile.")
+
+    profile, email = ui_user["profile"], ui_user["email"]
+    # Tests about login itself must drive the form every run, never a cached session.
+    fresh_login = request.node.get_closest_marker("fresh_login") is not None
+    state_path = None if fresh_login else auth_state_cache.load(profile, email)
+    context = acquire_context(request, context_pool, har_archive, storage_state=state_path)
+    page = open_page(context, browser_console)
+
+    login_page = LoginPage(page)
+    login_page.open_home()
+    restore_timeout = int(os.getenv("UI_AUTH_RESTORE_TIMEOUT", "5000"))
+    if state_path and login_page.is_session_restored(email, timeout=restore_timeout):
+        allure.attach(state_path, name="Reused cached login", attachment_type=allure.attachment_type.TEXT)
+    else:
+        if state_path:
+            # Cached session was rejected (expired token, app changes); fall back to a real login.
+            auth_state_cache.invalidate(profile, email)
+        with allure.step(f"Login as user: {email}"):
+            login_page.login(email, ui_user["password"])
+            login_page.wait_until_logged_in(email)
+        auth_state_cache.save(context, profile, email)
+
+    yield {
+        "page": page,
+        "login_page": login_page,
+        "user": ui_user,
+        "email": ui_user["email"],
+    }
+
+    try:
+        if login_page.is_tasks_section_visible():
+            with allure.step("Logout in fixture teardown"):
+                login_page.logout()
+    finally:
+        # The pool resets (or replaces) the context, so a failed logout cannot leak it or its session.
+        context_pool.release(context)
+
+
+@pytest.fixture
+def test_data_factory():
+    def _build(prefix="qa"):
+        token = data_token()
+        return {
+            "name": f"{prefix}_{token}",
+            "email": f"{prefix}_{token}@example.com",
+            "title": f"{prefix}_task_{token}",
+        }
+
+    return _build
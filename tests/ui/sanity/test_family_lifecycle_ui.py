@@ -1,7 +1,9 @@
 import os
-import uuid
 import pytest
 import allure
+from core.actors import ActorSession
+from core.journey import Journey, JourneyStep
+from core.parallel import data_token
 from pages.family_app_page import FamilyAppPage
 
 @allure.epic("Family App")
@@ -24,19 +26,16 @@ def ctx():
     return SanityContext()
 
 
-def _get_parent_credentials():
-    return {
-        "email": os.getenv("UI_USER_DEFAULT_EMAIL", os.getenv("UI_TEST_EMAIL", "ngjipiqmftuoxbkecx@nespj.com")),
-        "password": os.getenv("UI_USER_DEFAULT_PASSWORD", os.getenv("UI_TEST_PASSWORD", "123456")),
-    }
+@pytest.fixture
+def actors(page, page_factory):
+    return ActorSession.from_env(page, page_factory, FamilyAppPage)
 
 
-def _prepare_runtime_context(ctx):
-    creds = _get_parent_credentials()
-    token = uuid.uuid4().hex[:8]
+def _prepare_runtime_context(ctx, parent):
+    token = data_token()
 
-    ctx.parent_email = creds["email"]
-    ctx.parent_password = creds["password"]
+    ctx.parent_email = parent.email
+    ctx.parent_password = parent.password
     ctx.child_email = f"sanity.child.{token}@example.com"
     ctx.child_password = f"KidPass{token}"
     ctx.task_title = f"Sanity Task {token}"
@@ -53,14 +52,13 @@ def _attach_log(name, message):
     allure.attach(str(message), name=name, attachment_type=allure.attachment_type.TEXT)
 
 
-def parent_login(app, ctx):
+def parent_login(actors, ctx):
     with allure.step("01 Parent logs into the application"):
-        app.open_home()
-        app.login(ctx.parent_email, ctx.parent_password)
-        app.wait_until_logged_in(ctx.parent_email)
-        assert app.is_tasks_section_visible(), "Parent should be redirected to Tasks section after login."
-        assert app.is_sidebar_visible(), "Sidebar should be visible for logged-in parent."
-        _attach_log("Step01 diagnostics", app.get_ui_diagnostics())
+        app = actors.use("parent")
+        with app.batched_snapshot():
+            assert app.is_tasks_section_visible(), "Parent should be redirected to Tasks section after login."
+            assert app.is_sidebar_visible(), "Sidebar should be visible for logged-in parent."
+            _attach_log("Step01 diagnostics", app.get_ui_diagnostics())
         print("Parent logged in")
 
 
@@ -94,19 +92,20 @@ def create_child(app, ctx, child_display_name):
         print("Child created. Display name:", child_display_name)
 
 
-def child_login_and_verify_restrictions(app, ctx):
-    with allure.step("04 Switch user via UI logout/login to child"):
-        app.switch_user_via_ui(ctx.child_email, ctx.child_password)
-        assert app.is_tasks_section_visible(), "Child should land on Tasks section after login."
-        assert not app.is_family_settings_nav_visible(), "Child must not see Family Settings entry in sidebar."
-        _attach_log("Step04 child user", ctx.child_email)
-        _attach_log("Step04 diagnostics", app.get_ui_diagnostics())
+def child_login_and_verify_restrictions(actors, ctx):
+    with allure.step("04 Switch to child user"):
+        app = actors.use("child")
+        with app.batched_snapshot():
+            assert app.is_tasks_section_visible(), "Child should land on Tasks section after login."
+            assert not app.is_family_settings_nav_visible(), "Child must not see Family Settings entry in sidebar."
+            _attach_log("Step04 child user", ctx.child_email)
+            _attach_log("Step04 diagnostics", app.get_ui_diagnostics())
         print("Child logged in with restricted sidebar")
 
 
-def parent_assign_task(app, ctx, child_display_name):
+def parent_assign_task(actors, ctx, child_display_name):
     with allure.step("05 Switch back to parent and assign task to child"):
-        app.switch_user_via_ui(ctx.parent_email, ctx.parent_password)
+        app = actors.use("parent")
         app.create_task(
             title=ctx.task_title,
             assigned_member_text=ctx.child_email,
@@ -122,9 +121,9 @@ def parent_assign_task(app, ctx, child_display_name):
         print("Task assigned to child. " ,ctx.task_title)
 
 
-def child_complete_task(app, ctx):
+def child_complete_task(actors, ctx):
     with allure.step("Step 06 Child completes assigned task"):
-        app.switch_user_via_ui(ctx.child_email, ctx.child_password)
+        app = actors.use("child")
         assert app.wait_for_open_task(ctx.task_title), "Child should see assigned open task before completion."
         allure.attach(
             app.get_ui_diagnostics(),
@@ -160,9 +159,9 @@ def child_complete_task(app, ctx):
         print("Task completed by child")
 
 
-def parent_verify_archive(app, ctx, child_display_name):
+def parent_verify_archive(actors, ctx, child_display_name):
     with allure.step("Step 07: Parent verifies completed task in archive"):
-        app.switch_user_via_ui(ctx.parent_email, ctx.parent_password)
+        app = actors.use("parent")
         assert app.wait_for_archive_task(ctx.task_title), "Parent archive should contain completed child task."
         archived_task_text = app.get_task_card_text(ctx.task_title, in_archive=True)
         assert (
@@ -196,9 +195,9 @@ def parent_post_message(app, ctx):
         print("Parent message posted")
 
 
-def child_reply_to_message(app, ctx, reply_text):
+def child_reply_to_message(actors, ctx, reply_text):
     with allure.step("Step 11: Child replies to parent message"):
-        app.switch_user_via_ui(ctx.child_email, ctx.child_password)
+        app = actors.use("child")
         app.post_message(reply_text)
         assert app.message_exists(ctx.message_text), "Parent message should remain visible to child."
         assert app.message_exists(reply_text), "Child reply should appear in message feed."
@@ -210,36 +209,72 @@ def child_reply_to_message(app, ctx, reply_text):
 def child_permission_enforcement(app):
     with allure.step("Step 12: Child attempts direct access to add-member URL"):
         app.open_direct_settings_url()
-        assert not app.is_family_settings_nav_visible(), "Child direct navigation should not expose Family Settings sidebar link."
-        assert not app.is_family_settings_section_visible(), "Child should not be able to view family settings section."
-        assert not app.is_add_child_form_visible(), "Child should not be able to access add-child form."
-        _attach_log("Step12 diagnostics", app.get_ui_diagnostics())
+        with app.batched_snapshot():
+            assert not app.is_family_settings_nav_visible(), "Child direct navigation should not expose Family Settings sidebar link."
+            assert not app.is_family_settings_section_visible(), "Child should not be able to view family settings section."
+            assert not app.is_add_child_form_visible(), "Child should not be able to access add-child form."
+            _attach_log("Step12 diagnostics", app.get_ui_diagnostics())
         print("Child blocked from settings/add-member")
 
 
+def _journey_steps(actors, ctx, runtime):
+    """The journey as an ordered graph; requires names the steps whose state a step depends on."""
+    return [
+        JourneyStep("parent_login", lambda: parent_login(actors, ctx)),
+        JourneyStep("verify_family_exists", lambda: verify_family_exists(actors.use("parent")),
+                    requires=["parent_login"]),
+        JourneyStep("create_child", lambda: create_child(actors.use("parent"), ctx, runtime["child_display_name"]),
+                    requires=["verify_family_exists"]),
+        JourneyStep("child_login_and_verify_restrictions", lambda: child_login_and_verify_restrictions(actors, ctx),
+                    requires=["create_child"]),
+        #JourneyStep("parent_assign_task", lambda: parent_assign_task(actors, ctx, runtime["child_display_name"]),
+        #            requires=["create_child"]),
+        #JourneyStep("child_complete_task", lambda: child_complete_task(actors, ctx),
+        #            requires=["parent_assign_task", "child_login_and_verify_restrictions"]),
+        #JourneyStep("parent_verify_archive", lambda: parent_verify_archive(actors, ctx, runtime["child_display_name"]),
+        #            requires=["child_complete_task"]),
+        #JourneyStep("parent_create_calendar_event",
+        #            lambda: parent_create_calendar_event(actors.use("parent"), runtime["event_title"]),
+        #            requires=["parent_login"]),
+        #JourneyStep("skip_recurring_event_tbd", skip_recurring_event_tbd),
+        #JourneyStep("parent_post_message", lambda: parent_post_message(actors.use("parent"), ctx),
+        #            requires=["parent_login"]),
+        #JourneyStep("child_reply_to_message", lambda: child_reply_to_message(actors, ctx, runtime["reply_text"]),
+        #            requires=["parent_post_message", "child_login_and_verify_restrictions"]),
+        JourneyStep("child_permission_enforcement", lambda: child_permission_enforcement(actors.use("child")),
+                    requires=["child_login_and_verify_restrictions"]),
+    ]
+
+
+def _restore_state(ctx, runtime, state):
+    for name, value in state["ctx"].items():
+        setattr(ctx, name, value)
+    runtime.update(state["runtime"])
+
+
 @pytest.mark.sanity
-def test_family_lifecycle_ui_journey(page, ctx):
+def test_family_lifecycle_ui_journey(actors, ctx, leased_parent):
     """
     Stateful release-blocker sanity suite:
     Parent -> child creation -> user switching -> task lifecycle -> calendar -> messages -> permissions.
     This is intentionally one continuous journey (non-isolated flow).
+    Parent and child each keep their own logged-in context (UI_ACTOR_MODE=relogin restores logout/login switching).
+    A failed run can be continued with UI_JOURNEY_RESUME=last (or =<step name>) instead of starting over.
     """
-    app = FamilyAppPage(page)
-    runtime = _prepare_runtime_context(ctx)
-    child_display_name = runtime["child_display_name"]
-    reply_text = runtime["reply_text"]
-    event_title = runtime["event_title"]
+    runtime = _prepare_runtime_context(ctx, leased_parent)
+    journey = Journey(
+        "family_lifecycle",
+        _journey_steps(actors, ctx, runtime),
+        actors,
+        # The parent password comes from the lease on every run; keep it out of the checkpoint file.
+        get_state=lambda: {"ctx": {k: v for k, v in vars(ctx).items() if k != "parent_password"}, "runtime": runtime},
+        set_state=lambda state: _restore_state(ctx, runtime, state),
+        owner=leased_parent.email,
+    )
+    journey.restore()
     allure.attach(str(vars(ctx)), name="Sanity Context", attachment_type=allure.attachment_type.TEXT)
 
-    parent_login(app, ctx)
-    verify_family_exists(app)
-    create_child(app, ctx, child_display_name)
-    child_login_and_verify_restrictions(app, ctx)
-    #parent_assign_task(app, ctx, child_display_name)
-    #child_complete_task(app, ctx)
-    #parent_verify_archive(app, ctx, child_display_name)
-    #parent_create_calendar_event(app, event_title)
-    #skip_recurring_event_tbd()
-    #parent_post_message(app, ctx)
-    #child_reply_to_message(app, ctx, reply_text)
-    child_permission_enforcement(app)
+    actors.add("parent", ctx.parent_email, ctx.parent_password)
+    actors.add("child", ctx.child_email, ctx.child_password)
+
+    journey.run()
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from core.adaptive_timeouts import AdaptiveTimeouts, WaitTimer
+
+pytestmark = pytest.mark.unit
+
+SITE = "FamilyAppPage.wait_for_open_task"
+
+
+@pytest.fixture
+def timeouts(tmp_path):
+    return AdaptiveTimeouts(str(tmp_path / "wait_history.json"), factor=3.0, floor_ms=3000, min_samples=5)
+
+
+def _record(timeouts, *durations_ms):
+    for duration_ms in durations_ms:
+        timeouts.record(SITE, duration_ms)
+
+
+def test_default_is_used_without_enough_history(timeouts):
+    _record(timeouts, 100, 100, 100, 100)
+
+    assert timeouts.budget(SITE, 45000) == 45000
+    assert not timeouts.is_learned(SITE)
+
+
+def test_budget_is_p99_times_factor(timeouts):
+    _record(timeouts, *([1000] * 99 + [4000]))
+
+    assert timeouts.is_learned(SITE)
+    assert timeouts.budget(SITE, 45000) == 3000
+    timeouts.record(SITE, 4000)
+    assert timeouts.budget(SITE, 45000) == 12000
+
+
+def test_budget_never_drops_below_the_floor(timeouts):
+    _record(timeouts, 50, 60, 70, 80, 90)
+
+    assert timeouts.budget(SITE, 45000) == 3000
+
+
+def test_budget_is_capped_by_default_or_explicit_ceiling(timeouts, tmp_path):
+    _record(timeouts, 20000, 20000, 20000, 20000, 20000)
+    assert timeouts.budget(SITE, 45000) == 45000
+
+    capped = AdaptiveTimeouts(str(tmp_path / "other.json"), ceiling_ms=30000, min_samples=5)
+    _record(capped, 20000, 20000, 20000, 20000, 20000)
+    assert capped.budget(SITE, 90000) == 30000
+
+
+def test_disabled_always_uses_default(tmp_path):
+    disabled = AdaptiveTimeouts(str(tmp_path / "history.json"), enabled=False, min_samples=1)
+    disabled.record(SITE, 10)
+
+    assert disabled.budget(SITE, 45000) == 45000
+
+
+def test_timed_out_wait_counts_as_its_full_budget_and_raises_the_next_budget(timeouts):
+    _record(timeouts, 500, 500, 500, 500, 500)
+    timer = WaitTimer(timeouts, SITE, 45000)
+    assert timer.budget == 3000
+
+    with pytest.raises(PlaywrightTimeoutError):
+        with timer:
+            raise PlaywrightTimeoutError("Timeout 3000ms exceeded")
+
+    assert timeouts.summary()[SITE]["timeouts_this_run"] == 1
+    assert timeouts.budget(SITE, 45000) == 9000
+
+
+def test_other_errors_are_counted_but_not_recorded_as_durations(timeouts):
+    with pytest.raises(RuntimeError):
+        with WaitTimer(timeouts, SITE, 45000):
+            raise RuntimeError("page crashed")
+
+    assert timeouts.summary()[SITE] == {"samples": 0, "p99_ms": None, "timeouts_this_run": 1}
+
+
+def test_save_merges_with_history_written_by_another_session(timeouts):
+    other = AdaptiveTimeouts(timeouts.path, min_samples=5)
+    _record(timeouts, 100, 200)
+    _record(other, 300)
+    timeouts.save()
+    other.save()
+
+    with open(timeouts.path, encoding="utf-8") as source:
+        assert sorted(json.load(source)[SITE]) == [100, 200, 300]
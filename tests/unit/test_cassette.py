@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from core.cassette import Cassette, CassetteServer, body_hash
+
+pytestmark = pytest.mark.unit
+
+
+class FakeResponse:
+    def __init__(self, url, status_code, body, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = body
+        self.headers = headers or {"Content-Type": "application/json"}
+
+
+BASE = "https://gorest.co.in/public/v2"
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def _serve(cassette):
+        servers.append(CassetteServer(cassette).start())
+        return servers[-1]
+
+    yield _serve
+    for server in servers:
+        server.stop()
+
+
+def test_body_hash_ignores_key_order_and_whitespace():
+    assert body_hash({"a": 1, "b": 2}) == body_hash('{ "b": 2, "a": 1 }')
+    assert body_hash(None) == body_hash(b"") == ""
+    assert body_hash({"a": 1}) != body_hash({"a": 2})
+
+
+def test_lookup_matches_method_path_query_and_body():
+    cassette = Cassette("unused.jsonl.gz")
+    cassette.record("GET", None, FakeResponse(f"{BASE}/users?page=2", 200, "[2]"))
+    cassette.record("POST", {"name": "a"}, FakeResponse(f"{BASE}/users", 201, '{"id": 1}'))
+
+    assert cassette.lookup("GET", "/public/v2/users?page=2", "")["body"] == "[2]"
+    assert cassette.lookup("GET", "/public/v2/users?page=3", "") is None
+    assert cassette.lookup("POST", "/public/v2/users", body_hash({"name": "a"}))["status"] == 201
+    assert cassette.lookup("POST", "/public/v2/users", body_hash({"name": "b"})) is None
+
+
+def test_repeated_requests_replay_in_order_then_last_sticks():
+    cassette = Cassette("unused.jsonl.gz")
+    for status in (200, 404):
+        cassette.record("GET", None, FakeResponse(f"{BASE}/users/7", status, ""))
+
+    statuses = [cassette.lookup("GET", "/public/v2/users/7", "")["status"] for _ in range(3)]
+
+    assert statuses == [200, 404, 404]
+
+
+def test_save_and_load_round_trip_keeps_only_listed_headers(tmp_path):
+    path = str(tmp_path / "users.jsonl.gz")
+    cassette = Cassette(path)
+    cassette.record("GET", None, FakeResponse(
+        f"{BASE}/users", 200, "[]", {"Content-Type": "application/json", "Set-Cookie": "secret", "X-Pagination-Pages": "3"}
+    ))
+    cassette.save()
+
+    entry = Cassette.load(path).lookup("GET", "/public/v2/users", "")
+
+    assert entry["headers"] == {"Content-Type": "application/json", "X-Pagination-Pages": "3"}
+
+
+def test_server_mints_ids_and_tracks_create_get_delete(serve):
+    cassette = Cassette("unused.jsonl.gz")
+    cassette.record("POST", {"name": "recorded"}, FakeResponse(
+        f"{BASE}/users", 201, json.dumps({"id": 5, "name": "recorded", "status": "active"})
+    ))
+    server = serve(cassette)
+
+    status, _, body = server.respond("POST", "/public/v2/users", json.dumps({"name": "new"}).encode())
+    created = json.loads(body)
+    second = json.loads(server.respond("POST", "/public/v2/users", b'{"name": "other"}')[2])
+
+    assert status == 201
+    assert created["name"] == "new" and created["status"] == "active"
+    assert second["id"] == created["id"] + 1
+    item_path = f"/public/v2/users/{created['id']}"
+    assert server.respond("GET", item_path, b"")[0] == 200
+    assert server.respond("DELETE", item_path, b"")[0] == 204
+    assert server.respond("GET", item_path, b"")[0] == 404
+    assert server.respond("DELETE", item_path, b"")[0] == 404
+
+
+def test_server_answers_unrecorded_requests_with_501(serve):
+    server = serve(Cassette("unused.jsonl.gz"))
+
+    status, _, body = server.respond("GET", "/public/v2/posts", b"")
+
+    assert status == 501
+    assert "No cassette entry for GET /public/v2/posts" in body
@@ -0,0 +1,57 @@
+import pytest
+
+from core.console_buffer import ConsoleBuffer
+
+pytestmark = pytest.mark.unit
+
+
+class FakeMessage:
+    def __init__(self, type, text):
+        self.type = type
+        self.text = text
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+def test_ring_keeps_newest_entries_and_counts_evictions():
+    buffer = ConsoleBuffer("page 1", size=3)
+    for number in range(5):
+        buffer.on_console(FakeMessage("log", f"message {number}"))
+
+    assert [text for _, _, text in buffer.entries] == ["message 2", "message 3", "message 4"]
+    assert buffer.dropped == 2
+
+
+def test_messages_below_min_level_are_filtered_not_stored():
+    buffer = ConsoleBuffer("page 1", min_level="warning")
+    buffer.on_console(FakeMessage("log", "noise"))
+    buffer.on_console(FakeMessage("debug", "more noise"))
+    buffer.on_console(FakeMessage("warning", "careful"))
+    buffer.on_console(FakeMessage("error", "broken"))
+
+    assert [kind for _, kind, _ in buffer.entries] == ["warning", "error"]
+    assert buffer.filtered == 2
+
+
+def test_page_errors_are_always_kept_and_formatted():
+    buffer = ConsoleBuffer("page 2", min_level="error")
+    page = FakePage()
+    buffer.watch(page)
+    page.handlers["console"](FakeMessage("info", "skipped"))
+    page.handlers["pageerror"](ValueError("boom"))
+
+    report = buffer.format()
+
+    assert report.splitlines()[0] == "[page 2] 1 entries, 0 dropped (buffer full), 1 below level"
+    assert "PAGE ERROR boom" in report
+
+
+def test_unknown_level_is_rejected():
+    with pytest.raises(ValueError):
+        ConsoleBuffer("page 1", min_level="verbose")
@@ -0,0 +1,94 @@
+import json
+import os
+import time
+
+import pytest
+
+from core.credential_pool import CredentialPool
+
+pytestmark = pytest.mark.unit
+
+ACCOUNTS = [
+    {"email": "parent.one@example.com", "password": "one"},
+    {"email": "parent.two@example.com", "password": "two"},
+]
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return CredentialPool(ACCOUNTS, lock_dir=str(tmp_path), lease_seconds=60, wait_seconds=0, poll_seconds=0)
+
+
+def _expire(lease):
+    with open(lease.lock_path, encoding="utf-8") as source:
+        lock = json.load(source)
+    lock["expires_at"] = time.time() - 1
+    with open(lease.lock_path, "w", encoding="utf-8") as target:
+        json.dump(lock, target)
+
+
+def test_leases_are_exclusive_until_released(pool):
+    first = pool.acquire()
+    second = pool.acquire()
+
+    assert {first.email, second.email} == {account["email"] for account in ACCOUNTS}
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    pool.release(first)
+    assert pool.acquire().email == first.email
+
+
+def test_separate_pool_instances_share_the_lock_directory(pool, tmp_path):
+    other_process = CredentialPool(ACCOUNTS[:1], lock_dir=str(tmp_path), wait_seconds=0, poll_seconds=0)
+    pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        other_process.acquire()
+
+
+def test_expired_lease_is_taken_over(pool):
+    abandoned = pool.acquire()
+    pool.acquire()
+    _expire(abandoned)
+
+    taken = pool.acquire()
+
+    assert taken.email == abandoned.email
+    assert taken.token != abandoned.token
+
+
+def test_release_of_a_taken_over_lease_keeps_the_new_owner(pool):
+    abandoned = pool.acquire()
+    pool.acquire()
+    _expire(abandoned)
+    taken = pool.acquire()
+
+    pool.release(abandoned)
+
+    assert os.path.exists(taken.lock_path)
+    with open(taken.lock_path, encoding="utf-8") as source:
+        assert json.load(source)["token"] == taken.token
+
+
+def test_unreadable_lock_expires_by_file_age(pool):
+    lease = pool.acquire()
+    pool.acquire()
+    with open(lease.lock_path, "w", encoding="utf-8") as target:
+        target.write("{half-written")
+    old = time.time() - 120
+    os.utime(lease.lock_path, (old, old))
+
+    assert pool.acquire().email == lease.email
+
+
+def test_from_env_parses_inline_accounts_and_falls_back_to_default(monkeypatch):
+    monkeypatch.delenv("UI_CREDENTIAL_POOL_FILE", raising=False)
+    monkeypatch.setenv("UI_CREDENTIAL_POOL", "a@example.com:pw:with:colons, b@example.com:pw2")
+    assert CredentialPool.from_env({"email": "d", "password": "d"}).accounts == [
+        {"email": "a@example.com", "password": "pw:with:colons"},
+        {"email": "b@example.com", "password": "pw2"},
+    ]
+
+    monkeypatch.delenv("UI_CREDENTIAL_POOL")
+    assert CredentialPool.from_env({"email": "d", "password": "d"}).accounts == [{"email": "d", "password": "d"}]
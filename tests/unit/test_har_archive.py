@@ -0,0 +1,146 @@
+import json
+
+import pytest
+
+from core.har_archive import HarArchive
+
+pytestmark = pytest.mark.unit
+
+BASE = "https://firestore.googleapis.com/v1/projects/demo/documents"
+
+
+class FakeRequest:
+    def __init__(self, url, method="GET", post_data=None):
+        self.url = url
+        self.method = method
+        self.post_data = post_data
+        self.headers = {"content-type": "application/json"} if post_data else {}
+
+
+class FakeResponse:
+    status = 200
+    status_text = "OK"
+
+    def __init__(self, body):
+        self._body = body
+        self.headers = {"content-type": "application/json", "content-encoding": "gzip"}
+
+    def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, request, upstream=b""):
+        self.request = request
+        self.upstream = upstream
+        self.outcome = None
+
+    def fetch(self):
+        return FakeResponse(self.upstream)
+
+    def fulfill(self, **kwargs):
+        self.outcome = ("fulfill", kwargs)
+
+    def continue_(self):
+        self.outcome = ("continue", None)
+
+    def abort(self, error_code=None):
+        self.outcome = ("abort", error_code)
+
+
+def _entry(url, body, method="GET", post_data=None):
+    return {
+        "request": {
+            "method": method,
+            "url": url,
+            "headers": [],
+            "postData": {"mimeType": "application/json", "text": post_data} if post_data else {},
+        },
+        "response": {
+            "status": 200,
+            "statusText": "OK",
+            "headers": [{"name": "content-type", "value": "application/json"}],
+            "content": {"size": len(body), "mimeType": "application/json", "text": body},
+        },
+    }
+
+
+def _replay_archive(*entries):
+    archive = HarArchive("unused.har", "replay")
+    for entry in entries:
+        archive._index(entry)
+    return archive
+
+
+def _body(entry):
+    return entry["response"]["content"]["text"] if entry else None
+
+
+def test_exact_match_wins_over_looser_tiers():
+    archive = _replay_archive(
+        _entry(f"{BASE}/tasks?page=2", "page two"),
+        _entry(f"{BASE}/tasks", "post a", method="POST", post_data='{"title": "a"}'),
+        _entry(f"{BASE}/tasks", "post b", method="POST", post_data='{"title": "b"}'),
+    )
+
+    assert _body(archive.lookup("POST", f"{BASE}/tasks", '{"title": "b"}')) == "post b"
+    assert _body(archive.lookup("POST", f"{BASE}/tasks", '{"title": "a"}')) == "post a"
+    assert _body(archive.lookup("GET", f"{BASE}/tasks?page=2", None)) == "page two"
+
+
+def test_query_order_and_ignored_params_do_not_affect_the_match():
+    archive = _replay_archive(_entry(f"{BASE}/tasks?b=2&a=1&zx=abc&RID=10", "tasks"))
+
+    assert _body(archive.lookup("GET", f"{BASE}/tasks?a=1&RID=99&b=2&zx=other", None)) == "tasks"
+
+
+def test_body_hash_mismatch_falls_back_to_url_then_path():
+    archive = _replay_archive(_entry(f"{BASE}/tasks?view=full", "recorded", method="POST", post_data='{"n": 1}'))
+
+    assert _body(archive.lookup("POST", f"{BASE}/tasks?view=full", '{"n": 2}')) == "recorded"
+    assert _body(archive.lookup("POST", f"{BASE}/tasks?view=basic", '{"n": 2}')) == "recorded"
+    assert archive.lookup("GET", f"{BASE}/tasks?view=full", None) is None
+    assert archive.lookup("POST", f"{BASE}/users", '{"n": 1}') is None
+
+
+def test_repeated_requests_are_served_in_order_then_the_last_sticks():
+    archive = _replay_archive(_entry(f"{BASE}/tasks", "first"), _entry(f"{BASE}/tasks", "second"))
+
+    assert [_body(archive.lookup("GET", f"{BASE}/tasks", None)) for _ in range(3)] == ["first", "second", "second"]
+
+
+def test_replay_fulfills_matches_and_aborts_unmatched_and_streaming_requests():
+    archive = _replay_archive(_entry(f"{BASE}/tasks", '{"tasks": []}'))
+    matched = FakeRoute(FakeRequest(f"{BASE}/tasks"))
+    unmatched = FakeRoute(FakeRequest(f"{BASE}/users"))
+    streaming = FakeRoute(FakeRequest(f"{BASE}:listen/Listen/channel?VER=8"))
+
+    for route in (matched, unmatched, streaming):
+        archive._replay(route)
+
+    assert matched.outcome == ("fulfill", {"status": 200, "headers": {"content-type": "application/json"},
+                                           "body": b'{"tasks": []}'})
+    assert unmatched.outcome == streaming.outcome == ("abort", "internetdisconnected")
+    stats = archive.stats()
+    assert (stats["served"], stats["streaming_bypassed"], stats["unmatched_requests"]) == (1, 1, [f"GET {BASE}/users"])
+
+
+def test_recorded_archive_replays_after_save_and_load(tmp_path):
+    path = str(tmp_path / "har" / "test.har")
+    recorder = HarArchive(path, "record")
+    recorder._record(FakeRoute(FakeRequest(f"{BASE}/tasks", "POST", '{"title": "a"}'), upstream=b'{"id": 1}'))
+    recorder._record(FakeRoute(FakeRequest(f"{BASE}/blob"), upstream=b"\xff\xfe"))
+    streaming = FakeRoute(FakeRequest(f"{BASE}:write/Write/channel"))
+    recorder._record(streaming)
+    recorder.save()
+
+    with open(path, encoding="utf-8") as source:
+        assert len(json.load(source)["log"]["entries"]) == 2
+    assert streaming.outcome == ("continue", None)
+
+    replayer = HarArchive(path, "replay").load()
+    assert _body(replayer.lookup("POST", f"{BASE}/tasks", '{"title": "a"}')) == '{"id": 1}'
+    route = FakeRoute(FakeRequest(f"{BASE}/blob"))
+    replayer._replay(route)
+    assert route.outcome[1]["body"] == b"\xff\xfe"
+    assert route.outcome[1]["headers"] == {"content-type": "application/json"}
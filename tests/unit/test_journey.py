@@ -0,0 +1,159 @@
+import pytest
+
+from core.actors import ActorSession
+from core.journey import CheckpointStore, Journey, JourneyStep
+
+pytestmark = pytest.mark.unit
+
+
+class FakePage:
+    def __init__(self, storage_state=None):
+        self.state = storage_state or {}
+        self.context = self
+
+    def storage_state(self, indexed_db=False):
+        return dict(self.state)
+
+    def set_storage_state(self, state):
+        self.state = dict(state)
+
+
+class FakeApp:
+    logins = []
+
+    def __init__(self, page):
+        self.page = page
+
+    def open_home(self):
+        pass
+
+    def login(self, email, password):
+        FakeApp.logins.append(email)
+        self.page.state = {"user": email}
+
+    def wait_until_logged_in(self, email):
+        pass
+
+    def is_session_restored(self, email):
+        return self.page.state.get("user") == email
+
+
+class Context:
+    child_email = None
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("QA_CACHE_DIR", str(tmp_path))
+    FakeApp.logins = []
+
+
+def _run(resume="", fail_at=None, child_email="child.one@example.com", owner="parent@example.com"):
+    ctx = Context()
+    ctx.child_email = child_email
+    actors = ActorSession(FakePage(), lambda storage_state=None: FakePage(storage_state), FakeApp)
+    ran = []
+
+    def step(name, actor):
+        def run():
+            actors.use(actor)
+            if name == fail_at:
+                raise AssertionError(f"{name} failed")
+            ran.append(name)
+        return run
+
+    journey = Journey(
+        "unit",
+        [
+            JourneyStep("parent_login", step("parent_login", "parent")),
+            JourneyStep("create_child", step("create_child", "parent"), requires=["parent_login"]),
+            JourneyStep("child_login", step("child_login", "child"), requires=["create_child"]),
+            JourneyStep("child_checks", step("child_checks", "child"), requires=["child_login"]),
+        ],
+        actors,
+        get_state=lambda: {"child_email": ctx.child_email},
+        set_state=lambda state: setattr(ctx, "child_email", state["child_email"]),
+        owner=owner,
+        resume=resume,
+    )
+    restored = journey.restore()
+    actors.add("parent", "parent@example.com", "pw")
+    actors.add("child", ctx.child_email, "pw")
+    try:
+        journey.run()
+    except AssertionError:
+        pass
+    return {"ran": ran, "restored": restored, "ctx": ctx, "journey": journey}
+
+
+def test_resume_last_continues_after_newest_checkpoint_with_restored_state_and_sessions():
+    _run(fail_at="child_checks")
+    FakeApp.logins = []
+
+    rerun = _run(resume="last", child_email="child.two@example.com")
+
+    assert rerun["restored"] == ["parent_login", "create_child", "child_login"]
+    assert rerun["ran"] == ["child_checks"]
+    assert rerun["ctx"].child_email == "child.one@example.com"
+    assert FakeApp.logins == []
+
+
+def test_resume_from_named_step_uses_checkpoint_taken_before_it():
+    _run(fail_at="child_checks")
+
+    rerun = _run(resume="child_login")
+
+    assert rerun["restored"] == ["parent_login", "create_child"]
+    assert rerun["ran"] == ["child_login", "child_checks"]
+
+
+def test_checkpoint_of_another_account_is_ignored():
+    _run(fail_at="child_checks")
+
+    rerun = _run(resume="last", owner="other.parent@example.com")
+
+    assert rerun["restored"] == []
+    assert rerun["ran"] == ["parent_login", "create_child", "child_login", "child_checks"]
+
+
+def test_passing_journey_clears_its_checkpoints():
+    _run(fail_at="child_checks")
+    _run(resume="last")
+
+    assert _run(resume="last")["restored"] == []
+
+
+def test_accounts_running_side_by_side_keep_their_own_checkpoints():
+    _run(fail_at="child_checks", owner="parent.a@example.com")
+    _run(owner="parent.b@example.com")
+
+    rerun = _run(resume="last", owner="parent.a@example.com")
+
+    assert rerun["restored"] == ["parent_login", "create_child", "child_login"]
+    assert rerun["ran"] == ["child_checks"]
+
+
+def test_checkpoints_are_namespaced_by_owner_and_worker(monkeypatch):
+    monkeypatch.setenv("QA_WORKER_ID", "gw1")
+    store = CheckpointStore("unit", owner="Parent@Example.com ")
+
+    assert store.directory == CheckpointStore("unit", owner="parent@example.com").directory
+    assert store.directory.endswith("gw1")
+    assert "example.com" not in store.directory.lower()
+    monkeypatch.delenv("QA_WORKER_ID")
+    assert CheckpointStore("unit", owner="parent@example.com").directory != store.directory
+
+
+def test_expired_checkpoint_is_not_loaded():
+    store = CheckpointStore("expiry", ttl_seconds=-1)
+    store.save(0, "parent_login", {"completed": ["parent_login"]})
+
+    assert store.load(0, "parent_login") is None
+
+
+def test_unknown_resume_step_and_forward_requirements_are_rejected():
+    with pytest.raises(ValueError):
+        _run(resume="no_such_step")
+    with pytest.raises(ValueError):
+        Journey("bad", [JourneyStep("a", lambda: None, requires=["b"]), JourneyStep("b", lambda: None)],
+                actors=None, get_state=dict, set_state=lambda state: None)
@@ -0,0 +1,56 @@
+import pytest
+
+from core.latency import LatencyHistogram, LatencyRecorder, normalize_endpoint
+
+pytestmark = pytest.mark.unit
+
+
+def test_normalize_endpoint_collapses_ids_and_drops_query():
+    assert normalize_endpoint("/users/7581234") == "/users/{id}"
+    assert normalize_endpoint("/users/7581234/posts?page=2") == "/users/{id}/posts"
+    assert normalize_endpoint("/sessions/0b6f4f0e-5c1e-4c51-9a3b-8a3c0f0d9e21") == "/sessions/{id}"
+    assert normalize_endpoint("/users") == "/users"
+
+
+def test_percentiles_are_within_one_bucket_of_the_true_value():
+    histogram = LatencyHistogram()
+    for elapsed_ms in range(1, 1001):
+        histogram.record(float(elapsed_ms), 200)
+
+    for fraction, expected in ((0.50, 500), (0.95, 950), (0.99, 990)):
+        assert expected <= histogram.percentile(fraction) <= expected * LatencyHistogram.GROWTH
+
+
+def test_percentile_never_exceeds_the_observed_maximum():
+    histogram = LatencyHistogram()
+    histogram.record(123.0, 200)
+
+    assert histogram.percentile(0.99) == 123.0
+    assert LatencyHistogram().percentile(0.5) == 0.0
+
+
+def test_error_classes_are_counted_separately():
+    histogram = LatencyHistogram()
+    for status in (200, 201, 404, 422, 429, 500, None):
+        histogram.record(10.0, status)
+
+    summary = histogram.summary()
+
+    assert summary["count"] == 7
+    assert summary["error_rate"] == round(3 / 7, 4)
+    assert summary["client_error_rate"] == round(2 / 7, 4)
+
+
+def test_recorder_groups_by_method_and_normalized_endpoint_slowest_first():
+    recorder = LatencyRecorder()
+    recorder.record("GET", "/users/1", 10.0, 200)
+    recorder.record("GET", "/users/2", 30.0, 200)
+    recorder.record("DELETE", "/users/2", 500.0, 204)
+
+    rows = recorder.summary()
+
+    assert [(row["method"], row["endpoint"], row["count"]) for row in rows] == [
+        ("DELETE", "/users/{id}", 1),
+        ("GET", "/users/{id}", 2),
+    ]
+    assert "/users/{id}" in recorder.format_table()
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from core.paths import REPO_ROOT, cache_dir, reports_dir
+
+pytestmark = pytest.mark.unit
+
+
+def test_defaults_are_anchored_to_the_repo_root_not_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("QA_REPORTS_DIR", raising=False)
+    monkeypatch.delenv("QA_CACHE_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    assert reports_dir() == os.path.join(REPO_ROOT, "qa-reports")
+    assert cache_dir() == os.path.join(REPO_ROOT, ".qa-cache")
+    assert os.listdir(tmp_path) == []
+
+
+def test_relative_overrides_resolve_against_the_repo_root_and_absolute_ones_are_kept(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("QA_REPORTS_DIR", os.path.join("qa-reports", "workers", "gw0"))
+    monkeypatch.setenv("QA_CACHE_DIR", str(tmp_path / "cache"))
+
+    assert reports_dir() == os.path.join(REPO_ROOT, "qa-reports", "workers", "gw0")
+    assert cache_dir("browser-server") == str(tmp_path / "cache" / "browser-server")
+    assert os.path.isdir(tmp_path / "cache" / "browser-server")
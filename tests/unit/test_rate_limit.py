@@ -0,0 +1,110 @@
+import pytest
+
+from core import rate_limit
+from core.rate_limit import RateLimiter, TokenBucket
+
+pytestmark = pytest.mark.unit
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def quota_headers(limit, remaining, reset):
+    return {
+        "x-ratelimit-limit": str(limit),
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-reset": str(reset),
+    }
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(rate_limit.time, "sleep", delays.append)
+    return delays
+
+
+def test_bucket_serves_capacity_without_delay():
+    bucket = TokenBucket(rate=2.0, capacity=3)
+    bucket.updated = 100.0
+
+    assert [bucket.reserve(100.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_bucket_reservations_queue_in_arrival_order():
+    bucket = TokenBucket(rate=2.0, capacity=1)
+    bucket.updated = 100.0
+
+    delays = [bucket.reserve(100.0) for _ in range(4)]
+
+    assert delays == [0.0, 0.5, 1.0, 1.5]
+
+
+def test_bucket_refills_up_to_capacity_only():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    bucket.updated = 100.0
+    bucket.reserve(100.0)
+    bucket.reserve(100.0)
+
+    bucket.reserve(1000.0)
+
+    assert bucket.tokens == 1
+
+
+def test_bucket_sync_never_raises_tokens_above_server_remaining():
+    bucket = TokenBucket(rate=1.0, capacity=10)
+    bucket.updated = 100.0
+
+    bucket.sync(100.0, rate=0.5, capacity=10, remaining=4)
+
+    assert (bucket.tokens, bucket.rate) == (4, 0.5)
+
+
+def test_limiter_does_not_delay_before_first_response(sleeps):
+    limiter = RateLimiter()
+
+    for _ in range(5):
+        limiter.acquire()
+
+    assert sleeps == []
+    assert limiter.stats()["requests"] == 5
+
+
+def test_limiter_throttles_once_quota_is_used_up(sleeps):
+    limiter = RateLimiter()
+    limiter.acquire()
+    limiter.observe(FakeResponse(headers=quota_headers(limit=60, remaining=1, reset=60)))
+
+    limiter.acquire()
+    limiter.acquire()
+
+    assert len(sleeps) == 1
+    assert sleeps[0] == pytest.approx(1.0, abs=0.05)
+    assert limiter.stats()["rate_per_second"] == 1.0
+
+
+def test_limiter_waits_out_retry_after_on_429(sleeps):
+    limiter = RateLimiter(max_retries=1)
+    limiter.acquire()
+    response = FakeResponse(429, {"retry-after": "3"})
+    limiter.observe(response)
+
+    assert limiter.should_retry(response, attempt=0)
+    assert not limiter.should_retry(response, attempt=1)
+    limiter.acquire()
+    assert sleeps[0] == pytest.approx(3.0, abs=0.05)
+    assert limiter.stats()["responses_429"] == 1
+
+
+def test_disabled_limiter_never_sleeps_or_retries(sleeps):
+    limiter = RateLimiter(enabled=False)
+    response = FakeResponse(429, {"retry-after": "3"})
+    limiter.acquire()
+    limiter.observe(response)
+    limiter.acquire()
+
+    assert sleeps == []
+    assert not limiter.should_retry(response, attempt=0)
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from core.parallel import assign_units, build_units
+from core.sharding import DurationHistory, merge
+
+pytestmark = pytest.mark.unit
+
+
+class FakeMark:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeFixtureDef:
+    def __init__(self, scope):
+        self.scope = scope
+
+
+class FakeFixtureInfo:
+    def __init__(self, scopes):
+        self.name2fixturedefs = {f"fixture_{index}": [FakeFixtureDef(scope)] for index, scope in enumerate(scopes)}
+
+
+class FakeItem:
+    def __init__(self, nodeid, markers=(), scopes=("function",)):
+        self.nodeid = nodeid
+        self._markers = [FakeMark(name) for name in markers]
+        self._fixtureinfo = FakeFixtureInfo(scopes)
+
+    def iter_markers(self):
+        return iter(self._markers)
+
+    def __repr__(self):
+        return self.nodeid
+
+
+def test_modules_with_module_scoped_state_stay_in_one_unit():
+    journey = [FakeItem(f"tests/test_journey.py::test_{step}", scopes=("module",)) for step in "abc"]
+    independent = [FakeItem(f"tests/test_login.py::test_{name}") for name in "xy"]
+
+    units = build_units([journey[0], independent[0], journey[1], independent[1], journey[2]])
+
+    assert units == [journey, [independent[0]], [independent[1]]]
+
+
+def test_lpt_puts_heaviest_units_on_lightest_shards_and_keeps_collection_order():
+    weights = {"a": 8, "b": 7, "c": 6, "d": 5, "e": 4}
+    units = [[FakeItem(name)] for name in "abcde"]
+
+    shards = assign_units(units, 2, weight=lambda unit: weights[unit[0].nodeid])
+
+    assert [[item.nodeid for item in shard] for shard in shards] == [["a", "d", "e"], ["b", "c"]]
+
+
+def test_more_shards_than_units_leaves_empty_shards():
+    shards = assign_units([[FakeItem("a")]], 3)
+
+    assert [len(shard) for shard in shards] == [1, 0, 0]
+
+
+def test_unknown_tests_are_estimated_from_marker_mean_then_median(tmp_path):
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps({"t::smoke_a": 2.0, "t::smoke_b": 4.0, "t::other": 30.0}))
+    items = [
+        FakeItem("t::smoke_a", ["smoke"]), FakeItem("t::smoke_b", ["smoke"]), FakeItem("t::other"),
+        FakeItem("t::new_smoke", ["smoke"]), FakeItem("t::new_plain"),
+    ]
+
+    estimate = DurationHistory(str(path)).estimator(items)
+
+    assert estimate(items[2]) == 30.0
+    assert estimate(items[3]) == 3.0
+    assert estimate(items[4]) == 4.0
+
+
+def test_save_smooths_with_previous_history(tmp_path):
+    path = str(tmp_path / "durations.json")
+    history = DurationHistory(path)
+    history.add("t::a", 10.0)
+    history.save()
+
+    rerun = DurationHistory(path)
+    rerun.add("t::a", 1.0)
+    rerun.add("t::a", 1.0)
+    rerun.save()
+
+    assert DurationHistory(path).durations == {"t::a": 6.0}
+
+
+def test_merge_combines_shard_reports_and_changes_the_digest(tmp_path):
+    into = str(tmp_path / "durations.json")
+    before = DurationHistory(into).digest()
+    reports = []
+    for index, measured in enumerate(({"t::a": 1.0, "t::b": 2.0}, {"t::c": 3.0, "t::b": 4.0})):
+        report = tmp_path / f"shard-{index}.json"
+        report.write_text(json.dumps(measured))
+        reports.append(str(report))
+
+    history = merge(reports, into)
+
+    assert history.durations == {"t::a": 1.0, "t::b": 3.0, "t::c": 3.0}
+    assert history.digest() == DurationHistory(into).digest() != before
@@ -0,0 +1,54 @@
+import pytest
+
+from core.user_pool import UserPool
+
+pytestmark = pytest.mark.unit
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeAsyncClient:
+    def __init__(self, delete_results=None):
+        self.next_id = 0
+        self.delete_results = delete_results or {}
+        self.deleted = []
+
+    async def create_users(self, payloads, endpoint="/users"):
+        ids = list(range(self.next_id + 1, self.next_id + len(payloads) + 1))
+        self.next_id += len(payloads)
+        return ids
+
+    async def delete_users(self, user_ids, endpoint="/users"):
+        self.deleted.extend(user_ids)
+        return {user_id: self.delete_results.get(user_id, FakeResponse(204)) for user_id in user_ids}
+
+
+def test_shared_leases_return_to_the_pool_and_exclusive_ones_are_retired():
+    pool = UserPool(FakeAsyncClient(), dict, size=2)
+
+    shared = pool.lease()
+    pool.release(shared)
+    exclusive = pool.lease(exclusive=True)
+    pool.release(exclusive)
+
+    assert [pool.lease().user_id for _ in range(2)] == [shared.user_id, 3]
+
+
+def test_drain_deletes_everything_and_reports_only_real_failures():
+    client = FakeAsyncClient({
+        1: FakeResponse(404),
+        2: FakeResponse(500, "server error"),
+        3: ConnectionError("reset"),
+    })
+    pool = UserPool(client, dict, size=4)
+    pool.fill()
+
+    failures = pool.drain()
+
+    assert sorted(client.deleted) == [1, 2, 3, 4]
+    assert failures == {2: "500 server error", 3: "ConnectionError('reset')"}
+    assert pool.drain() == {}
@@ -0,0 +1,69 @@
+import pytest
+
+from core.base_page import BasePage
+from core.browser_metrics import measured
+from core.wait_profiler import WaitProfiler
+
+pytestmark = pytest.mark.unit
+
+
+class FakePage:
+    def goto(self, url):
+        pass
+
+    def click(self, selector):
+        pass
+
+    def wait_for_selector(self, selector, state="visible"):
+        pass
+
+
+class DisabledMetrics:
+    enabled = False
+
+
+class ToyPage(BasePage):
+    def __init__(self, profiler):
+        self.page = profiler.wrap_page(FakePage())
+        self._active_snapshot = None
+        self.browser_metrics = DisabledMetrics()
+
+    def _wait_for_banner(self):
+        self.page.wait_for_selector("#banner")
+
+    def open_dashboard(self):
+        self.open("https://example.test/dashboard")
+        self._wait_for_banner()
+
+    @measured("archive")
+    def archive(self):
+        self.click("#archive")
+
+
+def test_calls_are_credited_to_the_public_page_object_method():
+    profiler = WaitProfiler()
+    page = ToyPage(profiler)
+
+    page.open_dashboard()
+    page.archive()
+
+    owners = {row["page_method"]: row["count"] for row in profiler.by_page_method()}
+    assert owners == {"ToyPage.open_dashboard": 2, "ToyPage.archive": 1}
+
+
+def test_folded_stacks_skip_decorator_and_library_frames():
+    profiler = WaitProfiler()
+
+    ToyPage(profiler).archive()
+
+    stack = profiler.folded_stacks().split()[0]
+    assert stack.endswith("ToyPage.archive;ToyPage.click;click")
+    assert "wrapper" not in stack and "pytest" not in stack
+
+
+def test_calls_outside_page_objects_are_grouped_together():
+    profiler = WaitProfiler()
+
+    profiler.wrap_page(FakePage()).goto("https://example.test")
+
+    assert profiler.by_page_method()[0]["page_method"] == "<outside page objects>"
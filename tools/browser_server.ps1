@@ -0,0 +1,4 @@
+# Manage the long-lived browser server reused by UI runs (set UI_BROWSER_SERVER=on to connect to it).
+# Usage: .\tools\browser_server.ps1 start|status|stop [--headed]
+python -m core.browser_server @args
+exit $LASTEXITCODE